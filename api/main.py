@@ -13,7 +13,7 @@ import json
 import logging
 from pathlib import Path
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -181,7 +181,7 @@ async def health_check():
         status="healthy" if all_healthy else "degraded",
         service="meta-agent-api",
         version="1.0.0",
-        timestamp=datetime.utcnow().isoformat(),
+        timestamp=datetime.now(timezone.utc).isoformat(),
         checks=checks
     )
 
@@ -293,7 +293,7 @@ async def generate_agent(request: GenerateRequest):
             "num_steps": _count_workflow_steps(spec.workflow),
             "credentials_detected": list(generator.credential_params) if generator.credential_params else [],
             "tools_used": list(generator.all_tools) if generator.all_tools else [],
-            "generation_time": datetime.utcnow().isoformat(),
+            "generation_time": datetime.now(timezone.utc).isoformat(),
             "provider_used": request.provider
         }
 
@@ -13,6 +13,7 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 import logging
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -106,11 +107,11 @@ app.add_middleware(
 async def log_requests(request: Request, call_next):
     """Log all incoming requests."""
     logger.info(f"{request.method} {request.url.path}")
-    start_time = datetime.utcnow()
+    start = time.perf_counter()
 
     response = await call_next(request)
 
-    duration = (datetime.utcnow() - start_time).total_seconds()
+    duration = time.perf_counter() - start
     logger.info(
         f"{request.method} {request.url.path} "
         f"- {response.status_code} ({duration:.3f}s)"
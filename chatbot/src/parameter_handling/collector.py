@@ -6,10 +6,24 @@ grounded by the parameter schema from the JSON AST.
 """
 
 from typing import Dict, List, Optional
+from functools import lru_cache
 import json
 import anthropic
 
 
+@lru_cache(maxsize=1)
+def _get_client() -> anthropic.Anthropic:
+    """
+    Shared Anthropic client.
+
+    Created on first use and reused so every extraction call keeps the same
+    HTTP connection pool instead of opening a new TLS session.
+    """
+    import os
+
+    return anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+
+
 def create_collection_prompt(parameters: List[Dict]) -> str:
     """
     Generate a friendly prompt asking for parameter values.
@@ -79,8 +93,6 @@ async def extract_values_from_message(
     Returns:
         Dictionary of extracted parameter values
     """
-    import os
-
     # Build parameter schema for LLM
     schema_lines = []
     for param in parameters:
@@ -116,9 +128,7 @@ Return ONLY valid JSON, no explanation."""
 
     # Call Anthropic API
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-
-        message = client.messages.create(
+        message = _get_client().messages.create(
             model=model_name,
             max_tokens=1024,
             temperature=temperature,
@@ -26,10 +26,15 @@ from .errors import (
     ReasoningError,
     GenerationError,
 )
-from .graph import create_meta_agent_graph, run_meta_agent
+from .graph import create_meta_agent_graph, run_meta_agent, arun_meta_agent
+from .checkpointer import BatchedSqliteSaver
 from .nodes import (
     parser_node,
     reasoner_node,
+    areasoner_node,
+    reasoning_attempt_node,
+    areasoning_attempt_node,
+    select_candidate_node,
     validator_node,
     generator_node,
     escalation_node,
@@ -57,9 +62,15 @@ __all__ = [
     # Graph
     "create_meta_agent_graph",
     "run_meta_agent",
+    "arun_meta_agent",
+    "BatchedSqliteSaver",
     # Nodes
     "parser_node",
     "reasoner_node",
+    "areasoner_node",
+    "reasoning_attempt_node",
+    "areasoning_attempt_node",
+    "select_candidate_node",
     "validator_node",
     "generator_node",
     "escalation_node",
@@ -0,0 +1,70 @@
+"""
+Checkpointer helpers for meta-agent v2.
+
+LangGraph's SqliteSaver commits after every checkpoint write, i.e. once per
+node transition. BatchedSqliteSaver can defer those commits so a whole
+execution is written in a single transaction.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver that can group checkpoint writes into one transaction.
+
+    Outside of batched() it behaves exactly like SqliteSaver. Inside,
+    writes go through the same connection (so reads within the run see
+    them) but are only committed when the outermost batched() block exits.
+
+    Trade-off: a crash mid-run loses that run's checkpoints instead of
+    keeping the ones written before the crash.
+
+    Example:
+        >>> with BatchedSqliteSaver.from_conn_string("checkpoints.db") as saver:
+        ...     result = run_meta_agent(raw_spec=spec, checkpointer=saver)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._batch_depth = 0
+        self._batch_lock = threading.Lock()
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator:
+        """Get a cursor, deferring the commit while a batch is open."""
+        with super().cursor(transaction=transaction and self._batch_depth == 0) as cur:
+            yield cur
+
+    @contextmanager
+    def batched(self) -> Iterator["BatchedSqliteSaver"]:
+        """
+        Defer checkpoint commits until the block exits.
+
+        Blocks may nest (or overlap across threads sharing the saver); the
+        commit happens when the last one exits, even if it raised, so
+        checkpoints of a failed run are still kept for inspection.
+        """
+        with self._batch_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._batch_lock:
+                self._batch_depth -= 1
+                flush = self._batch_depth == 0
+            if flush:
+                self.flush()
+
+    def flush(self) -> None:
+        """Commit any checkpoint writes still pending on the connection."""
+        with self.lock:
+            self.conn.commit()
+        logger.debug("Flushed batched checkpoint writes")
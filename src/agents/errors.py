@@ -8,12 +8,26 @@ Provides granular error handling for different failure modes:
 - Generation errors (serialization issues)
 """
 
-from typing import List, Optional, Dict, Any
+from typing import ClassVar, List, Optional, Dict, Any
+
+
+def _truncate(text: str, limit: int = 500) -> str:
+    """Cut text to limit characters, marking the cut with '...'."""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + '...'
 
 
 class MetaAgentError(Exception):
     """Base exception for all meta-agent errors."""
 
+    # Class name reported as "type" by to_dict (set per subclass)
+    _type_name: ClassVar[str] = "MetaAgentError"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._type_name = cls.__name__
+
     def __init__(
         self,
         message: str,
@@ -29,13 +43,17 @@ class MetaAgentError(Exception):
             recoverable: Whether error can be fixed with retry/feedback
         """
         super().__init__(message)
-        self.message = message
         self.details = details or {}
         self.recoverable = recoverable
 
+    @property
+    def message(self) -> str:
+        """Human-readable error message."""
+        return self.args[0]
+
     def __str__(self) -> str:
         """Format error message with details."""
-        base = f"{self.__class__.__name__}: {self.message}"
+        base = f"{self._type_name}: {self.args[0]}"
         if self.details:
             details_str = "\n".join(f"  {k}: {v}" for k, v in self.details.items())
             return f"{base}\nDetails:\n{details_str}"
@@ -44,8 +62,8 @@ class MetaAgentError(Exception):
     def to_dict(self) -> Dict[str, Any]:
         """Serialize error to dictionary for state persistence."""
         return {
-            "type": self.__class__.__name__,
-            "message": self.message,
+            "type": self._type_name,
+            "message": self.args[0],
             "details": self.details,
             "recoverable": self.recoverable
         }
@@ -137,13 +155,16 @@ class ValidationError(MetaAgentError):
         Returns:
             ValidationError with formatted field errors
         """
-        field_errors = []
-        for error in pydantic_error.errors():
-            field_errors.append({
-                'field': '.'.join(str(loc) for loc in error['loc']),
+        # Only loc/msg/type are kept, so skip building URLs, context and input
+        errors = pydantic_error.errors(include_url=False, include_context=False, include_input=False)
+        field_errors = [
+            {
+                'field': '.'.join(map(str, error['loc'])),
                 'message': error['msg'],
                 'type': error['type']
-            })
+            }
+            for error in errors
+        ]
 
         # Create summary message
         error_count = len(field_errors)
@@ -186,7 +207,7 @@ class ReasoningError(MetaAgentError):
             details['confidence_score'] = confidence_score
         if llm_response:
             # Truncate long responses
-            details['llm_response'] = llm_response[:500] + ('...' if len(llm_response) > 500 else '')
+            details['llm_response'] = _truncate(llm_response)
         if retry_count > 0:
             details['retry_count'] = retry_count
 
@@ -229,7 +250,7 @@ class GenerationError(MetaAgentError):
         details = kwargs.get('details', {})
         if json_output:
             # Truncate long JSON
-            details['json_output'] = json_output[:500] + ('...' if len(json_output) > 500 else '')
+            details['json_output'] = _truncate(json_output)
 
         super().__init__(
             message=message,
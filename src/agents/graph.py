@@ -5,17 +5,29 @@ This module creates the StateGraph that orchestrates the workflow:
     START → Parser → Reasoner → Validator → Generator → END
               ↓         ↓          ↓
           [Error]  [Escalate] [Retry/Error]
+
+With parallel_attempts > 1 the reasoner is replaced by concurrent
+reasoning_attempt branches (LangGraph Send) joined by select_candidate.
 """
 
 import logging
-from typing import Literal
+from contextlib import nullcontext
+from typing import List, Literal, Optional, Tuple, Union
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.sqlite import SqliteSaver
 
-from .state import MetaAgentState, should_retry, build_feedback_message
+from .state import MetaAgentState, build_feedback_message
+from .checkpointer import BatchedSqliteSaver
 from .nodes import (
     parser_node,
     reasoner_node,
+    areasoner_node,
+    reasoning_attempt_node,
+    areasoning_attempt_node,
+    select_candidate_node,
     validator_node,
     generator_node,
     escalation_node
@@ -41,7 +53,17 @@ def create_meta_agent_graph(
 
     # Add nodes
     workflow.add_node("parser", parser_node)
-    workflow.add_node("reasoner", reasoner_node)
+    # Sync and async implementations: invoke() blocks on the LLM call,
+    # ainvoke() awaits it so executions can share an event loop
+    workflow.add_node(
+        "reasoner",
+        RunnableLambda(reasoner_node, afunc=areasoner_node, name="reasoner")
+    )
+    workflow.add_node(
+        "reasoning_attempt",
+        RunnableLambda(reasoning_attempt_node, afunc=areasoning_attempt_node, name="reasoning_attempt")
+    )
+    workflow.add_node("select_candidate", select_candidate_node)
     workflow.add_node("validator", validator_node)
     workflow.add_node("generator", generator_node)
     workflow.add_node("escalation", escalation_node)
@@ -70,6 +92,19 @@ def create_meta_agent_graph(
         }
     )
 
+    # Parallel attempts (parallel_attempts > 1) join here, then continue
+    # exactly like the single reasoner
+    workflow.add_edge("reasoning_attempt", "select_candidate")
+    workflow.add_conditional_edges(
+        "select_candidate",
+        _route_from_reasoner,
+        {
+            "validator": "validator",
+            "escalation": "escalation",
+            "end": END
+        }
+    )
+
     workflow.add_conditional_edges(
         "validator",
         _route_from_validator,
@@ -93,6 +128,9 @@ def create_meta_agent_graph(
     # Escalation always ends
     workflow.add_edge("escalation", END)
 
+    if isinstance(checkpointer, SqliteSaver):
+        _tune_sqlite_checkpointer(checkpointer)
+
     # Compile graph
     compiled = workflow.compile(checkpointer=checkpointer)
 
@@ -100,25 +138,69 @@ def create_meta_agent_graph(
     return compiled
 
 
+def _tune_sqlite_checkpointer(checkpointer: SqliteSaver) -> None:
+    """
+    Configure a SQLite checkpointer connection for per-step writes.
+
+    LangGraph commits a checkpoint after every node. WAL journaling with
+    synchronous=NORMAL avoids an fsync per commit while staying crash-safe,
+    and the larger page cache / mmap keep reads of recent checkpoints off disk.
+    In-memory databases ignore the journal settings.
+    """
+    with checkpointer.lock:
+        conn = checkpointer.conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA busy_timeout=5000")
+
+
 # ===== Routing Functions =====
 
-def _route_from_parser(state: MetaAgentState) -> Literal["reasoner", "escalation", "end"]:
+# validator next_action -> node; "retry" goes through _dispatch_reasoning
+_VALIDATOR_ROUTES = {
+    'generator': "generator",
+    'escalation': "escalation",
+}
+
+
+def _route_from_parser(
+    state: MetaAgentState
+) -> Union[Literal["reasoner", "escalation", "end"], List[Send]]:
     """
     Route from parser node based on parsing results.
 
     Returns:
-        - "reasoner": If parsing succeeded
+        - "reasoner" (or parallel attempts): If parsing succeeded
         - "escalation": If parsing failed with unrecoverable errors
         - "end": Should not happen from parser
     """
-    if state.get('parsing_errors'):
+    if state.get('parsing_errors') or state.get('execution_status') == 'error':
         logger.warning("Parser failed, escalating")
         return "escalation"
 
-    if state.get('execution_status') == 'error':
-        return "escalation"
+    return _dispatch_reasoning(state)
+
 
-    return "reasoner"
+def _dispatch_reasoning(state: MetaAgentState) -> Union[Literal["reasoner"], List[Send]]:
+    """
+    Start a reasoning round.
+
+    With parallel_attempts > 1, fans out that many reasoning_attempt
+    branches at increasing temperatures (joined by select_candidate), so a
+    round costs one LLM latency instead of one per attempt.
+    """
+    attempts = state.get('parallel_attempts', 1)
+    if attempts <= 1:
+        return "reasoner"
+
+    logger.info(f"Fanning out {attempts} reasoning attempts")
+    return [
+        Send("reasoning_attempt", {**state, 'attempt_id': i, 'attempt_temperature': (i + 1) / 10})
+        for i in range(attempts)
+    ]
 
 
 def _route_from_reasoner(state: MetaAgentState) -> Literal["validator", "escalation", "end"]:
@@ -134,40 +216,35 @@ def _route_from_reasoner(state: MetaAgentState) -> Literal["validator", "escalat
         logger.warning(f"Low confidence ({state.get('confidence_score', 0):.2f}), escalating")
         return "escalation"
 
-    if state.get('execution_status') == 'error':
-        return "escalation"
-
-    return "validator"
+    return "escalation" if state.get('execution_status') == 'error' else "validator"
 
 
 def _route_from_validator(
     state: MetaAgentState
-) -> Literal["generator", "reasoner", "escalation", "end"]:
+) -> Union[Literal["generator", "reasoner", "escalation", "end"], List[Send]]:
     """
-    Route from validator node based on validation results.
+    Route from validator node on the next_action it decided.
 
     Returns:
         - "generator": If validation passed
-        - "reasoner": If validation failed but retry is possible
+        - "reasoner" (or parallel attempts): If validation failed but retry is possible
         - "escalation": If retry limit reached or unrecoverable error
         - "end": Should not happen from validator
     """
-    if state.get('validation_errors'):
-        # Validation failed
-        if should_retry(state):
-            logger.info(f"Validation failed, retry {state.get('retry_count', 0)}/3")
-            return "reasoner"
-        else:
-            # Retry limit reached
-            logger.warning("Retry limit reached, escalating")
-            return "escalation"
-
-    if state.get('execution_status') == 'generating':
-        return "generator"
-
-    # Unexpected state
-    logger.error(f"Unexpected state in validator routing: {state.get('execution_status')}")
-    return "escalation"
+    action = state.get('next_action')
+    if action == 'retry':
+        logger.info(f"Validation failed, retry {state.get('retry_count', 0)}/3")
+        return _dispatch_reasoning(state)
+
+    route = _VALIDATOR_ROUTES.get(action)
+    if route is None:
+        # Unexpected state
+        logger.error(f"Unexpected state in validator routing: {state.get('execution_status')}")
+        return "escalation"
+
+    if route == "escalation":
+        logger.warning("Validation failed and cannot be retried, escalating")
+    return route
 
 
 def _route_from_generator(state: MetaAgentState) -> Literal["end", "escalation"]:
@@ -194,18 +271,27 @@ def run_meta_agent(
     llm_provider: str = "aimlapi",
     model_version: str = None,
     prompt_version: str = "2.0.0",
-    config: dict = None
+    config: dict = None,
+    parallel_attempts: int = 1,
+    use_reasoning_cache: bool = True,
+    use_json_mode: bool = True,
+    stream_llm_output: bool = True
 ) -> MetaAgentState:
     """
     Run the meta-agent state machine on a text specification.
 
     Args:
         raw_spec: Text workflow specification
-        checkpointer: SQLite saver for checkpointing (optional)
+        checkpointer: SQLite saver for checkpointing (optional; a BatchedSqliteSaver
+            commits the whole run in one transaction)
         llm_provider: LLM provider to use ('aimlapi' or 'gemini', default: 'aimlapi')
         model_version: LLM model to use (optional, reads from AIMLAPI_MODEL or GEMINI_MODEL env vars)
         prompt_version: Prompt template version
         config: LangGraph configuration (for thread_id, etc.)
+        parallel_attempts: Reasoning attempts to run concurrently per round (default 1)
+        use_reasoning_cache: Reuse validated inferences for identical specs (default True)
+        use_json_mode: Request native JSON output from providers that support it (default True)
+        stream_llm_output: Stream completions from providers that support it (default True)
 
     Returns:
         Final state after execution
@@ -221,6 +307,72 @@ def run_meta_agent(
         >>> print(result['execution_status'])
         'complete'
     """
+    graph, initial_state, config = _prepare_run(
+        raw_spec, checkpointer, llm_provider, model_version, prompt_version, config,
+        parallel_attempts, use_reasoning_cache, use_json_mode, stream_llm_output
+    )
+
+    # A BatchedSqliteSaver commits the whole execution in one transaction
+    batch = checkpointer.batched() if isinstance(checkpointer, BatchedSqliteSaver) else nullcontext()
+    with batch:
+        final_state = graph.invoke(initial_state, config=config)
+
+    logger.info(f"Execution complete. Status: {final_state.get('execution_status')}")
+
+    return final_state
+
+
+async def arun_meta_agent(
+    raw_spec: str,
+    checkpointer: BaseCheckpointSaver = None,
+    llm_provider: str = "aimlapi",
+    model_version: str = None,
+    prompt_version: str = "2.0.0",
+    config: dict = None,
+    parallel_attempts: int = 1,
+    use_reasoning_cache: bool = True,
+    use_json_mode: bool = True,
+    stream_llm_output: bool = True
+) -> MetaAgentState:
+    """
+    Async version of run_meta_agent.
+
+    Runs the graph with ainvoke, so the reasoner awaits the LLM instead of
+    blocking a thread and many executions can run on one event loop.
+    Takes the same arguments as run_meta_agent; a checkpointer must support
+    async access (e.g. AsyncSqliteSaver rather than SqliteSaver).
+
+    Returns:
+        Final state after execution
+
+    Example:
+        >>> result = asyncio.run(arun_meta_agent(raw_spec=spec, llm_provider="gemini"))
+    """
+    graph, initial_state, config = _prepare_run(
+        raw_spec, checkpointer, llm_provider, model_version, prompt_version, config,
+        parallel_attempts, use_reasoning_cache, use_json_mode, stream_llm_output
+    )
+
+    final_state = await graph.ainvoke(initial_state, config=config)
+
+    logger.info(f"Execution complete. Status: {final_state.get('execution_status')}")
+
+    return final_state
+
+
+def _prepare_run(
+    raw_spec: str,
+    checkpointer: Optional[BaseCheckpointSaver],
+    llm_provider: str,
+    model_version: Optional[str],
+    prompt_version: str,
+    config: Optional[dict],
+    parallel_attempts: int,
+    use_reasoning_cache: bool,
+    use_json_mode: bool,
+    stream_llm_output: bool
+) -> Tuple[StateGraph, MetaAgentState, dict]:
+    """Build the graph, initial state and run config for one execution."""
     from .state import create_initial_state
 
     # Create graph
@@ -231,7 +383,11 @@ def run_meta_agent(
         raw_spec=raw_spec,
         llm_provider=llm_provider,
         model_version=model_version,
-        prompt_version=prompt_version
+        prompt_version=prompt_version,
+        parallel_attempts=parallel_attempts,
+        use_reasoning_cache=use_reasoning_cache,
+        use_json_mode=use_json_mode,
+        stream_llm_output=stream_llm_output
     )
 
     # Run graph
@@ -241,11 +397,9 @@ def run_meta_agent(
     if config is None:
         config = {
             "configurable": {"thread_id": initial_state['execution_id']},
-            "recursion_limit": 10  # Limit to 10 iterations (parser + 3 retries * 3 nodes)
+            # Limit to 10 iterations (parser + 3 retries * 3 nodes); parallel
+            # rounds take one extra step each for the select_candidate join
+            "recursion_limit": 10 if parallel_attempts <= 1 else 14
         }
 
-    final_state = graph.invoke(initial_state, config=config)
-
-    logger.info(f"Execution complete. Status: {final_state.get('execution_status')}")
-
-    return final_state
+    return graph, initial_state, config
@@ -10,6 +10,13 @@ from typing import List, Dict, Any, Optional, Literal, Union
 import re
 import json
 
+# Validation patterns, compiled once at import
+_SNAKE_CASE_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+_DUNDER_RE = re.compile(r'\b__\w+__\b')
+_SEMVER_RE = re.compile(r'^\d+\.\d+\.\d+$')
+# {{variable}} or {{object.property}} reference; group 1 is the dotted name
+_VAR_REF_RE = re.compile(r'\{\{([a-z_][a-z0-9_]*(?:\.[a-z_][a-z0-9_]*)*)\}\}')
+
 
 def _validate_safe_condition(v: str, context: str = "condition") -> str:
     """
@@ -50,7 +57,7 @@ def _validate_safe_condition(v: str, context: str = "condition") -> str:
             )
 
     # Check for dunder patterns using regex (more specific than substring)
-    if re.search(r'\b__\w+__\b', v):
+    if _DUNDER_RE.search(v):
         raise ValueError(
             f"Dunder methods/attributes not allowed in {context}. "
             f"Only simple comparisons are allowed."
@@ -67,7 +74,7 @@ def _validate_safe_condition(v: str, context: str = "condition") -> str:
     # Check for variable references - should use {{var}} or {{obj.property}}
     if '$' in v or '{' in v:
         # Support both simple variables and nested properties
-        if not re.search(r'\{\{[a-z_][a-z0-9_]*(?:\.[a-z_][a-z0-9_]*)*\}\}', v):
+        if not _VAR_REF_RE.search(v):
             raise ValueError(
                 f"Variable references in {context} must use {{{{variable_name}}}} or {{{{object.property}}}} syntax"
             )
@@ -87,7 +94,7 @@ class WorkflowInput(BaseModel):
     @classmethod
     def validate_name(cls, v: str) -> str:
         """Ensure parameter name is valid Python identifier."""
-        if not re.match(r'^[a-z_][a-z0-9_]*$', v):
+        if not _SNAKE_CASE_RE.match(v):
             raise ValueError(
                 f"Invalid parameter name '{v}'. Must be snake_case starting with letter or underscore."
             )
@@ -146,7 +153,7 @@ class WorkflowOutput(BaseModel):
     @classmethod
     def validate_name(cls, v: str) -> str:
         """Ensure output name is valid Python identifier."""
-        if not re.match(r'^[a-z_][a-z0-9_]*$', v):
+        if not _SNAKE_CASE_RE.match(v):
             raise ValueError(
                 f"Invalid output name '{v}'. Must be snake_case starting with letter or underscore."
             )
@@ -184,7 +191,7 @@ class ToolCall(BaseModel):
         """Ensure tool name is valid Python function name."""
         if not v or not v.strip():
             raise ValueError("tool_name cannot be empty")
-        if not re.match(r'^[a-z_][a-z0-9_]*$', v):
+        if not _SNAKE_CASE_RE.match(v):
             raise ValueError(
                 f"Invalid tool name '{v}'. Must be snake_case starting with letter or underscore."
             )
@@ -198,7 +205,7 @@ class ToolCall(BaseModel):
         """Validate variable assignment target."""
         if v is None:
             return v
-        if not re.match(r'^[a-z_][a-z0-9_]*$', v):
+        if not _SNAKE_CASE_RE.match(v):
             raise ValueError(
                 f"Invalid variable name '{v}'. Must be snake_case starting with letter or underscore."
             )
@@ -212,7 +219,7 @@ class ToolCall(BaseModel):
         """Validate parameter structure and variable references."""
         for key, value in v.items():
             # Validate parameter key is valid identifier
-            if not re.match(r'^[a-z_][a-z0-9_]*$', key):
+            if not _SNAKE_CASE_RE.match(key):
                 raise ValueError(
                     f"Invalid parameter key '{key}'. Must be snake_case."
                 )
@@ -221,7 +228,7 @@ class ToolCall(BaseModel):
             if isinstance(value, str) and '{{' in value:
                 # Extract all variable references - support nested properties
                 # Pattern: variable name optionally followed by .property (can repeat)
-                refs = re.findall(r'\{\{([a-z_][a-z0-9_]*(?:\.[a-z_][a-z0-9_]*)*)\}\}', value)
+                refs = _VAR_REF_RE.findall(value)
                 if not refs:
                     raise ValueError(
                         f"Invalid variable reference format in '{value}'. "
@@ -338,7 +345,7 @@ class RoutingRule(BaseModel):
     @classmethod
     def validate_workflow_name(cls, v: str) -> str:
         """Validate workflow name reference."""
-        if not re.match(r'^[a-z_][a-z0-9_]*$', v):
+        if not _SNAKE_CASE_RE.match(v):
             raise ValueError(
                 f"Invalid workflow name '{v}'. Must be snake_case."
             )
@@ -363,7 +370,7 @@ class OrchestratorWorkflow(BaseModel):
         if not v:
             raise ValueError("Orchestrator must have at least one sub-workflow")
         for name in v.keys():
-            if not re.match(r'^[a-z_][a-z0-9_]*$', name):
+            if not _SNAKE_CASE_RE.match(name):
                 raise ValueError(
                     f"Invalid sub-workflow name '{name}'. Must be snake_case."
                 )
@@ -422,7 +429,7 @@ class WorkflowSpec(BaseModel):
     @classmethod
     def validate_name(cls, v: str) -> str:
         """Ensure workflow name is valid Python identifier."""
-        if not re.match(r'^[a-z_][a-z0-9_]*$', v):
+        if not _SNAKE_CASE_RE.match(v):
             raise ValueError(
                 f"Invalid workflow name '{v}'. Must be snake_case starting with letter or underscore."
             )
@@ -434,7 +441,7 @@ class WorkflowSpec(BaseModel):
     @classmethod
     def validate_version(cls, v: str) -> str:
         """Validate semantic version format."""
-        if not re.match(r'^\d+\.\d+\.\d+$', v):
+        if not _SEMVER_RE.match(v):
             raise ValueError(
                 f"Invalid version '{v}'. Must be semantic version (e.g., '1.0.0')"
             )
@@ -457,10 +464,7 @@ class WorkflowSpec(BaseModel):
             # Check parameters for variable references
             for param_value in node.parameters.values():
                 if isinstance(param_value, str):
-                    refs = re.findall(
-                        r'\{\{([a-z_][a-z0-9_]*(?:\.[a-z_][a-z0-9_]*)*)\}\}',
-                        param_value
-                    )
+                    refs = _VAR_REF_RE.findall(param_value)
                     for ref in refs:
                         root_ref = ref.split('.')[0]
                         if root_ref not in available_vars:
@@ -479,10 +483,7 @@ class WorkflowSpec(BaseModel):
 
         elif isinstance(node, ConditionalWorkflow):
             # Validate condition variables
-            refs = re.findall(
-                r'\{\{([a-z_][a-z0-9_]*(?:\.[a-z_][a-z0-9_]*)*)\}\}',
-                node.condition
-            )
+            refs = _VAR_REF_RE.findall(node.condition)
             for ref in refs:
                 root_ref = ref.split('.')[0]
                 if root_ref not in available_vars:
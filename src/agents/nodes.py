@@ -1,23 +1,88 @@
 """
 LangGraph node implementations for meta-agent v2.
 
-Each node is a function that takes MetaAgentState and returns updated state.
-Nodes are composed into a LangGraph StateGraph with conditional routing.
+Each node is a function that takes MetaAgentState and returns the keys it
+updates; LangGraph merges them into the running state, so nodes never copy
+the whole state. Nodes are composed into a LangGraph StateGraph with
+conditional routing.
 """
 
 import re
+import asyncio
+import copy
 import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-
-from .state import MetaAgentState, add_error_to_state
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet
+from datetime import datetime, timezone
+from functools import lru_cache
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib decoder
+    orjson = None
+
+from .state import MetaAgentState, add_error_to_state, should_retry
 from .errors import ParsingError, ValidationError, ReasoningError
 from .models import WorkflowSpec
 from pydantic import ValidationError as PydanticValidationError
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+# catching the stdlib exception either way
+_loads_json = orjson.loads if orjson is not None else json.loads
+
+# First characters a JSON document (or a ```json fence) can start with
+_JSON_START_CHARS = frozenset('{["-0123456789tfn`')
+
+# Provider instances shared across reasoner invocations, keyed on (provider, model)
+_PROVIDER_CACHE: Dict[Tuple[str, Optional[str]], Any] = {}
+_PROVIDER_CACHE_LOCK = threading.Lock()
+
+# LLM inferences keyed on a digest of (provider, model, prompt), oldest first;
+# entries are (expiry on the monotonic clock, structure, raw output)
+_REASONING_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any], str]]" = OrderedDict()
+_REASONING_CACHE_LOCK = threading.Lock()
+_REASONING_CACHE_SIZE = 1024
+_REASONING_CACHE_TTL = 24 * 60 * 60  # seconds; hosted models change behind a name
+
+# Workflow variant names that show up in Pydantic discriminated-union errors
+_WORKFLOW_VARIANT_RE = re.compile(r'(?:Orchestrator|Conditional|Parallel)Workflow')
+
+# Spec section patterns used by the parser
+_WORKFLOW_LINE_RE = re.compile(r'^Workflow:\s*(.+)$', re.MULTILINE | re.IGNORECASE)
+_DESCRIPTION_LINE_RE = re.compile(r'^Description:\s*(.+)$', re.MULTILINE | re.IGNORECASE)
+_INPUTS_SECTION_RE = re.compile(
+    r'^Inputs:\s*$(.*?)^(?:\w+:|$)', re.MULTILINE | re.IGNORECASE | re.DOTALL
+)
+_STEPS_SECTION_RE = re.compile(
+    r'^Steps:\s*$(.*?)^(?:\w+:|$)', re.MULTILINE | re.IGNORECASE | re.DOTALL
+)
+_OUTPUTS_SECTION_RE = re.compile(
+    r'^Outputs:\s*$(.*?)^(?:\w+:|$)', re.MULTILINE | re.IGNORECASE | re.DOTALL
+)
+# Item bodies are matched per line ([^\S\n] is whitespace other than newline)
+_LIST_ITEM_RE = re.compile(r'^[^\S\n]*[-*](.*)$', re.MULTILINE)
+_NUMBERED_STEP_RE = re.compile(r'^[^\S\n]*\d+\.[^\S\n]+(.+)$', re.MULTILINE)
+
+# Line starts of all section headers, found in one scan of the spec
+_SECTION_HEADER_RE = re.compile(
+    r'^(?:(?P<workflow>Workflow)|(?P<description>Description)|(?P<inputs>Inputs)'
+    r'|(?P<steps>Steps)|(?P<outputs>Outputs)):',
+    re.MULTILINE | re.IGNORECASE
+)
+_SECTION_PATTERNS = {
+    'workflow': _WORKFLOW_LINE_RE,
+    'description': _DESCRIPTION_LINE_RE,
+    'inputs': _INPUTS_SECTION_RE,
+    'steps': _STEPS_SECTION_RE,
+    'outputs': _OUTPUTS_SECTION_RE,
+}
+
 
 # ===== Parser Node (Deterministic) =====
 
@@ -36,76 +101,23 @@ def parser_node(state: MetaAgentState) -> MetaAgentState:
         state: Current state with raw_spec
 
     Returns:
-        Updated state with parsed_sections and parsing_errors
+        State update with parsed_sections and parsing_errors
     """
     logger.info("Parser node: Extracting sections from text spec")
     raw_spec = state['raw_spec']
 
     try:
-        sections = {}
-        errors = []
-
-        # Extract workflow name
-        workflow_match = re.search(
-            r'^Workflow:\s*(.+)$',
-            raw_spec,
-            re.MULTILINE | re.IGNORECASE
-        )
-        if workflow_match:
-            sections['workflow'] = workflow_match.group(1).strip()
-        else:
-            errors.append("Missing 'Workflow:' section")
+        cached_sections, cached_errors = _parse_spec(raw_spec)
 
-        # Extract description
-        desc_match = re.search(
-            r'^Description:\s*(.+)$',
-            raw_spec,
-            re.MULTILINE | re.IGNORECASE
-        )
-        if desc_match:
-            sections['description'] = desc_match.group(1).strip()
-        else:
-            errors.append("Missing 'Description:' section")
-
-        # Extract inputs
-        inputs_match = re.search(
-            r'^Inputs:\s*$(.*?)^(?:\w+:|$)',
-            raw_spec,
-            re.MULTILINE | re.IGNORECASE | re.DOTALL
-        )
-        if inputs_match:
-            inputs_text = inputs_match.group(1).strip()
-            sections['inputs'] = _parse_list_items(inputs_text)
-        else:
-            sections['inputs'] = []  # Inputs are optional
-
-        # Extract steps
-        steps_match = re.search(
-            r'^Steps:\s*$(.*?)^(?:\w+:|$)',
-            raw_spec,
-            re.MULTILINE | re.IGNORECASE | re.DOTALL
-        )
-        if steps_match:
-            steps_text = steps_match.group(1).strip()
-            sections['steps'] = _parse_numbered_steps(steps_text)
-        else:
-            errors.append("Missing 'Steps:' section")
-
-        # Extract outputs
-        outputs_match = re.search(
-            r'^Outputs:\s*$(.*?)^(?:\w+:|$)',
-            raw_spec,
-            re.MULTILINE | re.IGNORECASE | re.DOTALL
-        )
-        if outputs_match:
-            outputs_text = outputs_match.group(1).strip()
-            sections['outputs'] = _parse_list_items(outputs_text)
-        else:
-            sections['outputs'] = []  # Outputs are optional
+        # Copy cached results so callers can't mutate the shared entry
+        sections = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in cached_sections.items()
+        }
+        errors = list(cached_errors)
 
         # Update state
         return {
-            **state,
             'parsed_sections': sections,
             'parsing_errors': errors,
             'execution_status': 'reasoning' if not errors else 'error'
@@ -122,6 +134,75 @@ def parser_node(state: MetaAgentState) -> MetaAgentState:
         )
 
 
+@lru_cache(maxsize=256)
+def _parse_spec(raw_spec: str) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+    """
+    Extract sections from a raw text specification.
+
+    Parsing is deterministic, so results are memoized on the spec text and
+    re-running the same spec (retries, CI, workflow libraries) skips the
+    regex work entirely. Callers must not mutate the returned sections.
+
+    Returns:
+        Tuple of (sections dict, parsing errors)
+    """
+    sections = {}
+    errors = []
+
+    # One scan over the spec locates the header lines; each section pattern
+    # is then only tried at its own headers, and the scan stops as soon as
+    # every section has matched. Same result as searching for each pattern.
+    matches = {}
+    for header in _SECTION_HEADER_RE.finditer(raw_spec):
+        name = header.lastgroup
+        if name not in matches:
+            match = _SECTION_PATTERNS[name].match(raw_spec, header.start())
+            if match:
+                matches[name] = match
+                if len(matches) == len(_SECTION_PATTERNS):
+                    break
+
+    # Extract workflow name
+    workflow_match = matches.get('workflow')
+    if workflow_match:
+        sections['workflow'] = workflow_match.group(1).strip()
+    else:
+        errors.append("Missing 'Workflow:' section")
+
+    # Extract description
+    desc_match = matches.get('description')
+    if desc_match:
+        sections['description'] = desc_match.group(1).strip()
+    else:
+        errors.append("Missing 'Description:' section")
+
+    # Extract inputs
+    inputs_match = matches.get('inputs')
+    if inputs_match:
+        inputs_text = inputs_match.group(1).strip()
+        sections['inputs'] = _parse_list_items(inputs_text)
+    else:
+        sections['inputs'] = []  # Inputs are optional
+
+    # Extract steps
+    steps_match = matches.get('steps')
+    if steps_match:
+        steps_text = steps_match.group(1).strip()
+        sections['steps'] = _parse_numbered_steps(steps_text)
+    else:
+        errors.append("Missing 'Steps:' section")
+
+    # Extract outputs
+    outputs_match = matches.get('outputs')
+    if outputs_match:
+        outputs_text = outputs_match.group(1).strip()
+        sections['outputs'] = _parse_list_items(outputs_text)
+    else:
+        sections['outputs'] = []  # Outputs are optional
+
+    return sections, tuple(errors)
+
+
 def _parse_list_items(text: str) -> List[str]:
     """
     Parse bulleted/dashed list items.
@@ -133,14 +214,7 @@ def _parse_list_items(text: str) -> List[str]:
     Returns:
         List of item strings
     """
-    items = []
-    for line in text.split('\n'):
-        line = line.strip()
-        if line.startswith('-') or line.startswith('*'):
-            item = line[1:].strip()
-            if item:
-                items.append(item)
-    return items
+    return [item for match in _LIST_ITEM_RE.findall(text) if (item := match.strip())]
 
 
 def _parse_numbered_steps(text: str) -> List[str]:
@@ -155,16 +229,8 @@ def _parse_numbered_steps(text: str) -> List[str]:
     Returns:
         List of step descriptions
     """
-    steps = []
-    for line in text.split('\n'):
-        line = line.strip()
-        # Match numbered items: "1. ", "2. ", etc.
-        match = re.match(r'^\d+\.\s+(.+)$', line)
-        if match:
-            step = match.group(1).strip()
-            if step:
-                steps.append(step)
-    return steps
+    # Match numbered items: "1. ", "2. ", etc.
+    return [step for match in _NUMBERED_STEP_RE.findall(text) if (step := match.strip())]
 
 
 # ===== Reasoner Node (LLM-Powered) =====
@@ -183,197 +249,739 @@ def reasoner_node(state: MetaAgentState) -> MetaAgentState:
         state: Current state with parsed_sections
 
     Returns:
-        Updated state with inferred_structure, confidence_score, reasoning_trace
+        State update with inferred_structure, confidence_score, reasoning_trace
     """
     logger.info("Reasoner node: Using LLM to infer workflow structure")
 
     try:
-        # Get provider from state (default to aimlapi)
-        from .providers import create_provider
+        provider_name, provider, prompt, cache_key, cached = _prepare_reasoning(state)
+
+        if cached is not None:
+            logger.info("Reusing cached LLM inference for identical prompt")
+            inferred_structure = copy.deepcopy(cached[0])
+            llm_output = cached[1]
+        else:
+            inferred_structure, llm_output = _infer_structure(
+                provider, provider_name, prompt, state
+            )
+
+        return _complete_reasoning(state, inferred_structure, llm_output, cache_key)
+
+    except ReasoningError:
+        raise
+    except Exception as e:
+        logger.error(f"Reasoner node failed: {e}")
+        return add_error_to_state(
+            state,
+            stage='reasoner',
+            error_type=type(e).__name__,
+            message=str(e),
+            recoverable=True
+        )
+
+
+async def areasoner_node(state: MetaAgentState) -> MetaAgentState:
+    """
+    Async variant of reasoner_node used when the graph runs via ainvoke.
+
+    The LLM call is awaited instead of blocking a thread, so many executions
+    can share one event loop.
+
+    Args:
+        state: Current state with parsed_sections
+
+    Returns:
+        State update with inferred_structure, confidence_score, reasoning_trace
+    """
+    logger.info("Reasoner node: Using LLM to infer workflow structure")
+
+    try:
+        provider_name, provider, prompt, cache_key, cached = _prepare_reasoning(state)
+
+        if cached is not None:
+            logger.info("Reusing cached LLM inference for identical prompt")
+            inferred_structure = copy.deepcopy(cached[0])
+            llm_output = cached[1]
+        else:
+            inferred_structure, llm_output = await _ainfer_structure(
+                provider, provider_name, prompt, state
+            )
+
+        return _complete_reasoning(state, inferred_structure, llm_output, cache_key)
+
+    except ReasoningError:
+        raise
+    except Exception as e:
+        logger.error(f"Reasoner node failed: {e}")
+        return add_error_to_state(
+            state,
+            stage='reasoner',
+            error_type=type(e).__name__,
+            message=str(e),
+            recoverable=True
+        )
+
+
+def reasoning_attempt_node(state: MetaAgentState) -> MetaAgentState:
+    """
+    One of several concurrent reasoning attempts fanned out by the graph.
+
+    Runs the same prompt as reasoner_node at the attempt's own temperature
+    (state['attempt_temperature']) and records the outcome as a candidate
+    for select_candidate_node. Failures are recorded too, so one bad
+    attempt doesn't abort its siblings.
+
+    Args:
+        state: Current state plus attempt_id/attempt_temperature from the Send
+
+    Returns:
+        State update appending one entry to reasoning_candidates
+    """
+    try:
+        provider_name, provider, prompt, _, _ = _prepare_reasoning(state, use_cache=False)
+        inferred_structure, llm_output = _infer_structure(
+            provider, provider_name, prompt, state, state.get('attempt_temperature')
+        )
+        return {'reasoning_candidates': [_attempt_candidate(state, inferred_structure, llm_output)]}
+    except Exception as e:
+        logger.warning(f"Reasoning attempt {state.get('attempt_id')} failed: {e}")
+        return {'reasoning_candidates': [_attempt_candidate(state, error=str(e))]}
+
+
+async def areasoning_attempt_node(state: MetaAgentState) -> MetaAgentState:
+    """Async variant of reasoning_attempt_node used when the graph runs via ainvoke."""
+    try:
+        provider_name, provider, prompt, _, _ = _prepare_reasoning(state, use_cache=False)
+        inferred_structure, llm_output = await _ainfer_structure(
+            provider, provider_name, prompt, state, state.get('attempt_temperature')
+        )
+        return {'reasoning_candidates': [_attempt_candidate(state, inferred_structure, llm_output)]}
+    except Exception as e:
+        logger.warning(f"Reasoning attempt {state.get('attempt_id')} failed: {e}")
+        return {'reasoning_candidates': [_attempt_candidate(state, error=str(e))]}
+
 
-        provider_name = state.get('llm_provider', 'aimlapi')
-        model_override = state.get('model_version')
+def _attempt_candidate(
+    state: MetaAgentState,
+    inferred_structure: Optional[Dict[str, Any]] = None,
+    llm_output: Optional[str] = None,
+    error: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build a reasoning_candidates entry tagged with its round and attempt."""
+    return {
+        'retry_count': state.get('retry_count', 0),
+        'attempt_id': state.get('attempt_id', 0),
+        'inferred_structure': inferred_structure,
+        'llm_output': llm_output,
+        'error': error
+    }
 
-        logger.info(f"Using provider: {provider_name}")
 
-        # Create provider instance
-        provider = create_provider(provider_name, model=model_override)
+def select_candidate_node(state: MetaAgentState) -> MetaAgentState:
+    """
+    Join the parallel reasoning attempts of the current round.
+
+    Picks the first attempt (by attempt_id) whose structure passes
+    WorkflowSpec validation, otherwise the most confident one, and
+    publishes it exactly like reasoner_node would.
+
+    Args:
+        state: Current state with reasoning_candidates
 
-        # Build prompt from parsed sections
-        prompt = _build_reasoning_prompt(
-            state['parsed_sections'],
-            state.get('feedback_messages', [])
+    Returns:
+        State update with inferred_structure, confidence_score, reasoning_trace
+    """
+    retry_count = state.get('retry_count', 0)
+    candidates = sorted(
+        (c for c in state.get('reasoning_candidates', []) if c['retry_count'] == retry_count),
+        key=lambda c: c['attempt_id']
+    )
+    succeeded = [c for c in candidates if c['error'] is None]
+
+    logger.info(f"Selecting from {len(succeeded)}/{len(candidates)} successful reasoning attempts")
+
+    if not succeeded:
+        errors = "; ".join(c['error'] for c in candidates)
+        logger.error(f"All reasoning attempts failed: {errors}")
+        return add_error_to_state(
+            state,
+            stage='reasoner',
+            error_type='ReasoningError',
+            message=f"All {len(candidates)} reasoning attempts failed: {errors}",
+            recoverable=True
         )
 
-        # NEW: Add validation error feedback if retrying
-        if state.get('retry_count', 0) > 0 and state.get('validation_errors'):
-            validation_feedback = _format_validation_feedback(
-                state['validation_errors'],
-                state.get('last_generated_json')
+    chosen = None
+    for candidate in succeeded:
+        try:
+            WorkflowSpec(**candidate['inferred_structure'])
+        except (PydanticValidationError, TypeError):
+            continue
+        chosen = candidate
+        break
+
+    if chosen is None:
+        chosen = max(
+            succeeded,
+            key=lambda c: _calculate_confidence(c['inferred_structure'], state['parsed_sections'])
+        )
+
+    logger.info(f"Using reasoning attempt {chosen['attempt_id']}")
+
+    return _complete_reasoning(
+        state, chosen['inferred_structure'], chosen['llm_output'], None
+    )
+
+
+def _prepare_reasoning(
+    state: MetaAgentState,
+    use_cache: bool = True
+) -> Tuple[str, Any, str, Optional[str], Optional[Tuple[Dict[str, Any], str]]]:
+    """
+    Resolve the provider, build the prompt and look up the reasoning cache.
+
+    Args:
+        state: Current state with parsed_sections
+        use_cache: Whether to consult the reasoning cache at all
+
+    Returns:
+        Tuple of (provider_name, provider, prompt, cache_key, cached result)
+    """
+    # Get provider from state (default to aimlapi)
+    provider_name = state.get('llm_provider', 'aimlapi')
+    model_override = state.get('model_version')
+
+    logger.info(f"Using provider: {provider_name}")
+
+    # Reuse provider instance (and its HTTP client) across invocations
+    provider = _get_cached_provider(provider_name, model_override)
+
+    # Build prompt from parsed sections
+    prompt = _build_reasoning_prompt(
+        state['parsed_sections'],
+        state.get('feedback_messages', [])
+    )
+
+    # NEW: Add validation error feedback if retrying
+    if state.get('retry_count', 0) > 0 and state.get('validation_errors'):
+        validation_feedback = _format_validation_feedback(
+            state['validation_errors'],
+            state.get('last_generated_json')
+        )
+        prompt += f"\n{validation_feedback}"
+        logger.info(f"Added validation feedback for retry #{state['retry_count']}")
+
+    # Reuse a validated inference for an identical prompt. Retry rounds
+    # always ask the LLM again: they exist because the last answer failed.
+    cache_key = None
+    cached = None
+    if use_cache and state.get('retry_count', 0) == 0 and state.get('use_reasoning_cache', True):
+        cache_key = _reasoning_cache_key(provider_name, model_override, prompt)
+        cached = _lookup_reasoning_result(cache_key)
+
+    return provider_name, provider, prompt, cache_key, cached
+
+
+def _complete_reasoning(
+    state: MetaAgentState,
+    inferred_structure: Dict[str, Any],
+    llm_output: str,
+    cache_key: Optional[str]
+) -> Dict[str, Any]:
+    """Score an inferred structure and build the reasoner state update."""
+    # Calculate confidence score
+    confidence = _calculate_confidence(
+        inferred_structure,
+        state['parsed_sections']
+    )
+
+    logger.info(f"Reasoning complete. Confidence: {confidence:.2f}")
+
+    # Update state
+    return {
+        'inferred_structure': inferred_structure,
+        'last_generated_json': llm_output,  # NEW: Store for feedback on retry
+        'confidence_score': confidence,
+        'reasoning_trace': [f"LLM inference at {datetime.now(timezone.utc).isoformat()}"],
+        'execution_status': 'validating',
+        'should_escalate': confidence < 0.8,
+        # The validator caches the inference once it passes; escalated
+        # inferences are never cached
+        'reasoning_cache_key': cache_key if confidence >= 0.8 else None
+    }
+
+
+def _infer_structure(
+    provider,
+    provider_name: str,
+    prompt: str,
+    state: MetaAgentState,
+    temperature: Optional[float] = None
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Call the LLM and parse its output into a workflow structure.
+
+    Picks Gemini structured output, Claude JSON generation or regular
+    generation (with JSON repair for Gemini) depending on the provider.
+    temperature overrides the per-mode default when given.
+
+    Returns:
+        Tuple of (inferred_structure, raw LLM output)
+
+    Raises:
+        ReasoningError: If the LLM output cannot be turned into JSON
+    """
+    if _uses_structured_output(provider, provider_name, state):
+        # Use structured output for Gemini (guaranteed JSON validity)
+        logger.info("Using Gemini structured output mode")
+        try:
+            llm_output = provider.generate_structured(**_structured_output_args(prompt, temperature))
+
+            # With structured output, JSON is guaranteed valid
+            inferred_structure = _loads_json(llm_output)
+            logger.info("Structured output produced valid JSON")
+            return inferred_structure, llm_output
+
+        except Exception as e:
+            logger.warning(f"Structured output failed, falling back to regular: {e}")
+
+    elif _uses_claude_json(provider, provider_name):
+        # Use Claude's JSON generation capability
+        logger.info("Using Claude JSON generation mode")
+        try:
+            llm_output = provider.generate_json(**_claude_json_args(prompt, temperature))
+            # Claude's generate_json returns validated JSON string
+            inferred_structure = _loads_json(llm_output)
+            logger.info("Claude produced valid JSON")
+            return inferred_structure, llm_output
+        except Exception as e:
+            raise _claude_json_error(e, state)
+
+    # Regular generation (original code)
+    logger.debug(f"Calling LLM: {provider.get_model_name()}")
+    generate_args = dict(
+        system_prompt=_get_system_prompt(),
+        user_prompt=prompt,
+        temperature=_default_temperature(provider_name, temperature),
+        max_tokens=4000
+    )
+    if _use_json_mode(provider, state):
+        try:
+            llm_output = _call_llm(provider, state, generate_args, json_mode=True)
+        except Exception as e:
+            # Only a rejected response format is worth a second call; early
+            # stream aborts (ReasoningError) and API failures propagate
+            if not _json_mode_rejected(provider, e):
+                raise
+            logger.warning(f"JSON mode rejected, falling back to regular: {e}")
+            llm_output = _call_llm(provider, state, generate_args)
+    else:
+        llm_output = _call_llm(provider, state, generate_args)
+
+    return _parse_llm_output(llm_output, provider_name, state)
+
+
+async def _ainfer_structure(
+    provider,
+    provider_name: str,
+    prompt: str,
+    state: MetaAgentState,
+    temperature: Optional[float] = None
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Async counterpart of _infer_structure.
+
+    Awaits the provider's async methods (agenerate, agenerate_structured,
+    agenerate_json); a provider that only implements the blocking variant
+    of a JSON mode has it run in a worker thread instead.
+
+    Returns:
+        Tuple of (inferred_structure, raw LLM output)
+
+    Raises:
+        ReasoningError: If the LLM output cannot be turned into JSON
+    """
+    if _uses_structured_output(provider, provider_name, state):
+        logger.info("Using Gemini structured output mode")
+        try:
+            llm_output = await _acall_provider(
+                provider, 'generate_structured', **_structured_output_args(prompt, temperature)
             )
-            prompt += f"\n{validation_feedback}"
-            logger.info(f"Added validation feedback for retry #{state['retry_count']}")
-
-        # Determine if we should use structured output
-        use_structured = (
-            provider_name == 'gemini' and
-            hasattr(provider, 'generate_structured') and
-            state.get('use_structured_output', True)  # Can be disabled via state
+            inferred_structure = _loads_json(llm_output)
+            logger.info("Structured output produced valid JSON")
+            return inferred_structure, llm_output
+
+        except Exception as e:
+            logger.warning(f"Structured output failed, falling back to regular: {e}")
+
+    elif _uses_claude_json(provider, provider_name):
+        logger.info("Using Claude JSON generation mode")
+        try:
+            llm_output = await _acall_provider(
+                provider, 'generate_json', **_claude_json_args(prompt, temperature)
+            )
+            inferred_structure = _loads_json(llm_output)
+            logger.info("Claude produced valid JSON")
+            return inferred_structure, llm_output
+        except Exception as e:
+            raise _claude_json_error(e, state)
+
+    logger.debug(f"Calling LLM: {provider.get_model_name()}")
+    generate_args = dict(
+        system_prompt=_get_system_prompt(),
+        user_prompt=prompt,
+        temperature=_default_temperature(provider_name, temperature),
+        max_tokens=4000
+    )
+    if _use_json_mode(provider, state):
+        try:
+            llm_output = await _acall_llm(provider, state, generate_args, json_mode=True)
+        except Exception as e:
+            # Only a rejected response format is worth a second call; early
+            # stream aborts (ReasoningError) and API failures propagate
+            if not _json_mode_rejected(provider, e):
+                raise
+            logger.warning(f"JSON mode rejected, falling back to regular: {e}")
+            llm_output = await _acall_llm(provider, state, generate_args)
+    else:
+        llm_output = await _acall_llm(provider, state, generate_args)
+
+    return _parse_llm_output(llm_output, provider_name, state)
+
+
+def _uses_structured_output(provider, provider_name: str, state: MetaAgentState) -> bool:
+    """Whether to use Gemini structured output (schema-constrained JSON)."""
+    return (
+        provider_name == 'gemini' and
+        hasattr(provider, 'generate_structured') and
+        state.get('use_structured_output', True)  # Can be disabled via state
+    )
+
+
+def _uses_claude_json(provider, provider_name: str) -> bool:
+    """Whether to use Claude's JSON generation (validated, with one retry)."""
+    return provider_name in ('claude', 'anthropic') and hasattr(provider, 'generate_json')
+
+
+def _structured_output_args(prompt: str, temperature: Optional[float]) -> Dict[str, Any]:
+    """Arguments for generate_structured / agenerate_structured."""
+    # Get JSON schema for WorkflowSpec
+    from .schema_converter import generate_workflow_schema
+
+    # Only serialized by the provider, so the cached schema can be shared
+    workflow_schema = generate_workflow_schema(shared=True)
+    logger.debug(f"Generated schema with {len(workflow_schema.get('properties', {}))} properties")
+
+    return dict(
+        system_prompt=_get_system_prompt(),
+        user_prompt=prompt,
+        response_schema=workflow_schema,
+        temperature=0.05 if temperature is None else temperature,  # Lower for Gemini
+        max_tokens=4000
+    )
+
+
+def _claude_json_args(prompt: str, temperature: Optional[float]) -> Dict[str, Any]:
+    """Arguments for generate_json / agenerate_json."""
+    return dict(
+        system_prompt=_get_system_prompt(),
+        user_prompt=prompt,
+        temperature=0.1 if temperature is None else temperature,
+        max_tokens=4000,
+        retry_on_invalid=True  # Claude will retry once if JSON is invalid
+    )
+
+
+def _claude_json_error(e: Exception, state: MetaAgentState) -> ReasoningError:
+    """ReasoningError for a failed Claude JSON generation."""
+    logger.warning(f"Claude JSON generation failed: {e}")
+    return ReasoningError(
+        f"Claude JSON generation failed: {e}",
+        llm_response=str(e),
+        retry_count=state.get('retry_count', 0)
+    )
+
+
+async def _acall_provider(provider, method: str, **kwargs) -> str:
+    """Await provider.a<method> if it exists, else run the blocking method in a thread."""
+    async_method = getattr(provider, f"a{method}", None)
+    if async_method is not None:
+        return await async_method(**kwargs)
+    return await asyncio.to_thread(getattr(provider, method), **kwargs)
+
+
+def _call_llm(provider, state: MetaAgentState, generate_args: Dict[str, Any], **extra) -> str:
+    """Regular generation, streamed when the provider supports it."""
+    if hasattr(provider, 'generate_stream') and state.get('stream_llm_output', True):  # Can be disabled via state
+        return _collect_stream(
+            provider.generate_stream(**generate_args, **extra), state, _can_abort_stream(state)
         )
+    return provider.generate(**generate_args, **extra)
 
-        # Check if we should use Claude's JSON generation
-        use_claude_json = (
-            provider_name in ('claude', 'anthropic') and
-            hasattr(provider, 'generate_json')
+
+async def _acall_llm(provider, state: MetaAgentState, generate_args: Dict[str, Any], **extra) -> str:
+    """Async counterpart of _call_llm."""
+    if hasattr(provider, 'agenerate_stream') and state.get('stream_llm_output', True):  # Can be disabled via state
+        return await _acollect_stream(
+            provider.agenerate_stream(**generate_args, **extra), state, _can_abort_stream(state)
         )
+    return await provider.agenerate(**generate_args, **extra)
 
-        if use_structured:
-            # Use structured output for Gemini (guaranteed JSON validity)
-            logger.info("Using Gemini structured output mode")
 
-            # Get JSON schema for WorkflowSpec
-            from .schema_converter import generate_workflow_schema
+def _can_abort_stream(state: MetaAgentState) -> bool:
+    """Whether non-JSON output is final (Gemini output still goes through JSON repair)."""
+    return state.get('llm_provider', 'aimlapi') != 'gemini'
 
-            try:
-                workflow_schema = generate_workflow_schema()
-                logger.debug(f"Generated schema with {len(workflow_schema.get('properties', {}))} properties")
-
-                llm_output = provider.generate_structured(
-                    system_prompt=_get_system_prompt(),
-                    user_prompt=prompt,
-                    response_schema=workflow_schema,
-                    temperature=0.05,  # Lower for Gemini
-                    max_tokens=4000
-                )
 
-                # With structured output, JSON is guaranteed valid
-                inferred_structure = json.loads(llm_output)
-                logger.info("Structured output produced valid JSON")
+def _collect_stream(chunks, state: MetaAgentState, check_head: bool = True) -> str:
+    """
+    Join streamed chunks, giving up as soon as the output can't be JSON.
+
+    A response that opens with prose would fail JSON parsing once complete,
+    so (with check_head) the stream is closed at the first non-whitespace
+    chunk instead of waiting for (and paying for) the rest of the generation.
+    """
+    parts = []
+    checked = not check_head
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            if not checked and chunk.strip():
+                _check_stream_head(chunk, state)
+                checked = True
+    finally:
+        chunks.close()
+    return "".join(parts).strip()
+
+
+async def _acollect_stream(chunks, state: MetaAgentState, check_head: bool = True) -> str:
+    """Async counterpart of _collect_stream."""
+    parts = []
+    checked = not check_head
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            if not checked and chunk.strip():
+                _check_stream_head(chunk, state)
+                checked = True
+    finally:
+        await chunks.aclose()
+    return "".join(parts).strip()
+
+
+def _check_stream_head(head: str, state: MetaAgentState) -> None:
+    """Raise ReasoningError if the start of a streamed response rules out JSON."""
+    head = head.lstrip()
+    if head[0] not in _JSON_START_CHARS:
+        raise ReasoningError(
+            f"LLM output is not valid JSON: starts with {head[:40]!r}",
+            llm_response=head,
+            retry_count=state.get('retry_count', 0)
+        )
+
+
+def _use_json_mode(provider, state: MetaAgentState) -> bool:
+    """Whether to ask the provider for a bare JSON response (no markdown fences)."""
+    return (
+        getattr(provider, 'supports_json_mode', False) and
+        state.get('use_json_mode', True)  # Can be disabled via state
+    )
+
+
+def _json_mode_rejected(provider, error: Exception) -> bool:
+    """Whether the provider reports error as a rejection of JSON mode."""
+    if isinstance(error, ReasoningError):
+        return False
+    check = getattr(provider, 'is_json_mode_rejection', None)
+    return check is not None and check(error)
+
+
+def _default_temperature(provider_name: str, temperature: Optional[float]) -> float:
+    """Temperature for regular generation (lower for Gemini) unless overridden."""
+    if temperature is not None:
+        return temperature
+    return 0.1 if provider_name != 'gemini' else 0.05
+
+
+def _parse_llm_output(
+    llm_output: str,
+    provider_name: str,
+    state: MetaAgentState
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Parse raw LLM text into a workflow structure.
+
+    Strips markdown fences and, for Gemini, falls back to JSON repair.
+
+    Returns:
+        Tuple of (inferred_structure, cleaned LLM output)
+
+    Raises:
+        ReasoningError: If the output cannot be turned into JSON
+    """
+    logger.debug(f"LLM response length: {len(llm_output)} chars")
+
+    # Clean markdown code fences if present
+    if llm_output.startswith('```'):
+        llm_output = llm_output[3:].removeprefix('json').lstrip()
+        llm_output = llm_output.removesuffix('```').rstrip()
+
+    # Parse JSON with repair fallback
+    try:
+        if not _is_json_complete(llm_output):
+            # Truncated output (e.g. max_tokens hit) - skip the doomed full parse
+            raise json.JSONDecodeError(
+                "Unterminated JSON document (output likely truncated)",
+                llm_output,
+                len(llm_output)
+            )
+        inferred_structure = _loads_json(llm_output)
+    except json.JSONDecodeError as e:
+        logger.warning(f"JSON parse failed, attempting repair: {e}")
+
+        # Try to repair if using Gemini
+        if provider_name == 'gemini':
+            from .json_repair import repair_gemini_json
+
+            # Get available variables for repair
+            available_vars = _extract_var_names(
+                tuple(state['parsed_sections'].get('inputs', ()))
+            )
 
-            except Exception as e:
-                logger.warning(f"Structured output failed, falling back to regular: {e}")
-                # Fall back to regular generation
-                use_structured = False
+            repaired_json = repair_gemini_json(llm_output, available_vars)
 
-        if use_claude_json and not use_structured:
-            # Use Claude's JSON generation capability
-            logger.info("Using Claude JSON generation mode")
             try:
-                llm_output = provider.generate_json(
-                    system_prompt=_get_system_prompt(),
-                    user_prompt=prompt,
-                    temperature=0.1,
-                    max_tokens=4000,
-                    retry_on_invalid=True  # Claude will retry once if JSON is invalid
-                )
-                # Claude's generate_json returns validated JSON string
-                inferred_structure = json.loads(llm_output)
-                logger.info("Claude produced valid JSON")
-            except Exception as e:
-                logger.warning(f"Claude JSON generation failed: {e}")
+                inferred_structure = _loads_json(repaired_json)
+                logger.info("JSON repair successful")
+            except json.JSONDecodeError:
+                logger.error(f"JSON repair failed, original error: {e}")
                 raise ReasoningError(
-                    f"Claude JSON generation failed: {e}",
-                    llm_response=str(e),
+                    f"LLM output is not valid JSON even after repair: {e}",
+                    llm_response=llm_output,
                     retry_count=state.get('retry_count', 0)
                 )
-
-        elif not use_structured and not use_claude_json:
-            # Regular generation (original code)
-            logger.debug(f"Calling LLM: {provider.get_model_name()}")
-            llm_output = provider.generate(
-                system_prompt=_get_system_prompt(),
-                user_prompt=prompt,
-                temperature=0.1 if provider_name != 'gemini' else 0.05,
-                max_tokens=4000
+        else:
+            # Non-Gemini providers don't need repair typically
+            raise ReasoningError(
+                f"LLM output is not valid JSON: {e}",
+                llm_response=llm_output,
+                retry_count=state.get('retry_count', 0)
             )
 
-            logger.debug(f"LLM response length: {len(llm_output)} chars")
+    return inferred_structure, llm_output
 
-            # Clean markdown code fences if present
-            if llm_output.startswith('```'):
-                llm_output = re.sub(r'^```(?:json)?\s*', '', llm_output)
-                llm_output = re.sub(r'\s*```$', '', llm_output)
 
-            # Parse JSON with repair fallback
-            try:
-                inferred_structure = json.loads(llm_output)
-            except json.JSONDecodeError as e:
-                logger.warning(f"JSON parse failed, attempting repair: {e}")
-
-                # Try to repair if using Gemini
-                if provider_name == 'gemini':
-                    from .json_repair import repair_gemini_json
-
-                    # Get available variables for repair
-                    available_vars = set()
-                    # Add input variables
-                    for inp in state['parsed_sections'].get('inputs', []):
-                        # Extract variable name from either:
-                        # - "var_name (type): description" format
-                        # - "var_name: description" format
-                        if '(' in inp and ')' in inp:
-                            # Format with type in parentheses
-                            var_name = inp.split('(')[0].strip()
-                        elif ':' in inp:
-                            # Simple format without parentheses
-                            var_name = inp.split(':')[0].strip()
-                        else:
-                            # Fallback: use whole string as variable name
-                            var_name = inp.strip()
-
-                        if var_name:  # Only add non-empty variable names
-                            available_vars.add(var_name)
-
-                    repaired_json = repair_gemini_json(llm_output, available_vars)
-
-                    try:
-                        inferred_structure = json.loads(repaired_json)
-                        logger.info("JSON repair successful")
-                    except json.JSONDecodeError:
-                        logger.error(f"JSON repair failed, original error: {e}")
-                        raise ReasoningError(
-                            f"LLM output is not valid JSON even after repair: {e}",
-                            llm_response=llm_output,
-                            retry_count=state.get('retry_count', 0)
-                        )
-                else:
-                    # Non-Gemini providers don't need repair typically
-                    raise ReasoningError(
-                        f"LLM output is not valid JSON: {e}",
-                        llm_response=llm_output,
-                        retry_count=state.get('retry_count', 0)
-                    )
-
-        # Calculate confidence score
-        confidence = _calculate_confidence(
-            inferred_structure,
-            state['parsed_sections']
-        )
+def _reasoning_cache_key(provider_name: str, model: Optional[str], prompt: str) -> str:
+    """Build a stable digest identifying an LLM inference request."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (provider_name, model or '', prompt):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
 
-        logger.info(f"Reasoning complete. Confidence: {confidence:.2f}")
 
-        # Update state
-        return {
-            **state,
-            'inferred_structure': inferred_structure,
-            'last_generated_json': llm_output,  # NEW: Store for feedback on retry
-            'confidence_score': confidence,
-            'reasoning_trace': [f"LLM inference at {datetime.utcnow().isoformat()}"],
-            'execution_status': 'validating',
-            'should_escalate': confidence < 0.8
-        }
+def _lookup_reasoning_result(key: str) -> Optional[Tuple[Dict[str, Any], str]]:
+    """Fetch an unexpired inference from the reasoning cache, marking it recently used."""
+    with _REASONING_CACHE_LOCK:
+        entry = _REASONING_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _REASONING_CACHE[key]
+            return None
+        _REASONING_CACHE.move_to_end(key)
+        return entry[1:]
+
+
+def _store_reasoning_result(
+    key: str,
+    inferred_structure: Dict[str, Any],
+    llm_output: str
+) -> None:
+    """Store an inference in the bounded LRU reasoning cache."""
+    expires = time.monotonic() + _REASONING_CACHE_TTL
+    with _REASONING_CACHE_LOCK:
+        _REASONING_CACHE[key] = (expires, copy.deepcopy(inferred_structure), llm_output)
+        _REASONING_CACHE.move_to_end(key)
+        while len(_REASONING_CACHE) > _REASONING_CACHE_SIZE:
+            _REASONING_CACHE.popitem(last=False)
 
-    except ReasoningError:
-        raise
-    except Exception as e:
-        logger.error(f"Reasoner node failed: {e}")
-        return add_error_to_state(
-            state,
-            stage='reasoner',
-            error_type=type(e).__name__,
-            message=str(e),
-            recoverable=True
-        )
+
+def _forget_reasoning_result(key: str) -> None:
+    """Drop an inference from the reasoning cache, e.g. after it failed validation."""
+    with _REASONING_CACHE_LOCK:
+        _REASONING_CACHE.pop(key, None)
+
+
+def _get_cached_provider(provider_name: str, model: Optional[str] = None):
+    """
+    Get or create a provider instance shared across reasoner invocations.
+
+    Providers hold SDK clients with keep-alive connection pools, so reusing
+    them avoids re-authenticating and re-connecting on every retry and run.
+    """
+    from .providers import create_provider
+
+    key = (provider_name, model)
+    provider = _PROVIDER_CACHE.get(key)
+    if provider is None:
+        with _PROVIDER_CACHE_LOCK:
+            provider = _PROVIDER_CACHE.get(key)
+            if provider is None:
+                provider = create_provider(provider_name, model=model)
+                _PROVIDER_CACHE[key] = provider
+    return provider
+
+
+def _is_json_complete(text: str) -> bool:
+    """
+    Cheap probe for truncated JSON documents.
+
+    An object or array that does not end with its matching closing bracket
+    can never parse, so callers can go straight to repair. Only the ends of
+    the string are inspected; anything else is left to the real parser.
+
+    Returns:
+        False if the document is definitely truncated, True otherwise
+    """
+    text = text.strip()
+    if not text:
+        return False
+    opener = text[0]
+    if opener == '{':
+        return text[-1] == '}'
+    if opener == '[':
+        return text[-1] == ']'
+    return True
+
+
+@lru_cache(maxsize=128)
+def _extract_var_names(inputs: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    Extract variable names from parsed input items.
+
+    Handles both "var_name (type): description" and "var_name: description"
+    formats, falling back to the whole string. Memoized on the inputs tuple
+    so repeated repair attempts for the same spec skip the parsing.
+
+    Returns:
+        Frozen set of non-empty variable names
+    """
+    names = set()
+    for inp in inputs:
+        if '(' in inp and ')' in inp:
+            # Format with type in parentheses
+            var_name = inp.partition('(')[0].strip()
+        elif ':' in inp:
+            # Simple format without parentheses
+            var_name = inp.partition(':')[0].strip()
+        else:
+            # Fallback: use whole string as variable name
+            var_name = inp.strip()
+
+        if var_name:  # Only add non-empty variable names
+            names.add(var_name)
+    return frozenset(names)
 
 
 def _build_reasoning_prompt(
@@ -387,38 +995,33 @@ def _build_reasoning_prompt(
         f"Workflow: {sections.get('workflow', 'N/A')}",
         f"Description: {sections.get('description', 'N/A')}",
         "",
-        "Inputs:"
+        "Inputs:",
+        *[f"  - {inp}" for inp in sections.get('inputs', [])],
+        "",
+        "Steps:",
+        *[f"  {i}. {step}" for i, step in enumerate(sections.get('steps', []), 1)],
+        "",
+        "Outputs:",
+        *[f"  - {out}" for out in sections.get('outputs', [])],
     ]
 
-    for inp in sections.get('inputs', []):
-        prompt_parts.append(f"  - {inp}")
-
-    prompt_parts.append("")
-    prompt_parts.append("Steps:")
-    for i, step in enumerate(sections.get('steps', []), 1):
-        prompt_parts.append(f"  {i}. {step}")
-
-    prompt_parts.append("")
-    prompt_parts.append("Outputs:")
-    for out in sections.get('outputs', []):
-        prompt_parts.append(f"  - {out}")
-
     # Add feedback from previous attempts if any
     if feedback:
-        prompt_parts.append("")
-        prompt_parts.append("Previous attempt had these issues:")
-        for msg in feedback:
-            prompt_parts.append(f"  - {msg}")
+        prompt_parts += ["", "Previous attempt had these issues:"]
+        prompt_parts += [f"  - {msg}" for msg in feedback]
 
     return "\n".join(prompt_parts)
 
 
+@lru_cache(maxsize=1)
 def _get_system_prompt() -> str:
     """
     Get system prompt for LLM reasoning.
 
     Loads the v2.1 Gemini-optimized prompt from file.
     Falls back to inline prompt if file not found.
+    The prompt is read once per process; call _get_system_prompt.cache_clear()
+    after editing the file to pick up changes.
     """
     from pathlib import Path
 
@@ -481,19 +1084,24 @@ def _format_validation_feedback(
         "Your previous JSON had these issues:\n"
     ]
 
-    # Group errors by pattern
-    type_errors = [e for e in validation_errors if "type: Input should be" in e]
-    field_errors = [e for e in validation_errors if "Field required" in e]
-    variable_errors = [e for e in validation_errors if "references undefined variable" in e]
-    other_errors = [e for e in validation_errors
-                   if e not in type_errors + field_errors + variable_errors]
+    # Group errors by pattern in a single pass
+    type_errors, field_errors, variable_errors, other_errors = [], [], [], []
+    has_workflow_type_marker = False
+    for e in validation_errors:
+        if "type: Input should be" in e:
+            type_errors.append(e)
+            if not has_workflow_type_marker and _WORKFLOW_VARIANT_RE.search(e):
+                has_workflow_type_marker = True
+        elif "Field required" in e:
+            field_errors.append(e)
+        elif "references undefined variable" in e:
+            variable_errors.append(e)
+        else:
+            other_errors.append(e)
 
     # Check if this looks like a discriminated union error (many type errors across different workflow types)
     has_many_type_errors = len(type_errors) > 10
-    is_discriminated_union_issue = has_many_type_errors and any(
-        "OrchestratorWorkflow" in e or "ConditionalWorkflow" in e or "ParallelWorkflow" in e
-        for e in type_errors
-    )
+    is_discriminated_union_issue = has_many_type_errors and has_workflow_type_marker
 
     if is_discriminated_union_issue:
         feedback_parts.extend([
@@ -592,24 +1200,21 @@ def _calculate_confidence(
     Returns:
         Confidence score (0.0 to 1.0)
     """
-    score = 1.0
-
-    # Check completeness
-    if 'name' not in structure:
-        score -= 0.3
-    if 'description' not in structure:
-        score -= 0.1
-    if 'workflow' not in structure:
-        score -= 0.5
-
-    # Check step count
-    expected_steps = len(sections.get('steps', []))
-    if 'workflow' in structure:
-        workflow = structure['workflow']
-        if workflow.get('type') == 'sequential':
-            actual_steps = len(workflow.get('steps', []))
-            if actual_steps != expected_steps:
-                score -= 0.2
+    workflow = structure.get('workflow')
+    steps_mismatch = (
+        workflow is not None and
+        workflow.get('type') == 'sequential' and
+        len(workflow.get('steps', ())) != len(sections.get('steps', ()))
+    )
+
+    # Completeness and step count, each carrying a fixed penalty
+    score = (
+        1.0
+        - 0.3 * ('name' not in structure)
+        - 0.1 * ('description' not in structure)
+        - 0.5 * (workflow is None)
+        - 0.2 * steps_mismatch
+    )
 
     # Ensure score is in valid range
     return max(0.0, min(1.0, score))
@@ -625,13 +1230,14 @@ def validator_node(state: MetaAgentState) -> MetaAgentState:
     1. Attempts to create WorkflowSpec from inferred_structure
     2. Catches Pydantic validation errors
     3. Formats errors for feedback
-    4. Determines if retry or escalation needed
+    4. Determines if retry or escalation needed (next_action)
 
     Args:
         state: Current state with inferred_structure
 
     Returns:
-        Updated state with workflow_spec, validation_errors
+        State update with workflow_spec, serialized_spec, validation_errors,
+        next_action
     """
     logger.info("Validator node: Validating structure with Pydantic")
 
@@ -641,45 +1247,64 @@ def validator_node(state: MetaAgentState) -> MetaAgentState:
 
         logger.info("✓ Validation passed")
 
+        # Cache the inference only now that it is known to be valid (a cache
+        # hit is already in there; storing it again would extend its TTL)
+        cache_key = state.get('reasoning_cache_key')
+        if cache_key is not None and _lookup_reasoning_result(cache_key) is None:
+            _store_reasoning_result(
+                cache_key, state['inferred_structure'], state.get('last_generated_json')
+            )
+
         # Update state with validated spec
         return {
-            **state,
             'workflow_spec': spec.to_dict(),
+            'serialized_spec': spec.to_json(indent=2),
             'validation_errors': [],
-            'execution_status': 'generating'
+            'execution_status': 'generating',
+            'next_action': 'generator'
         }
 
     except PydanticValidationError as e:
         # Parse Pydantic errors into readable format
-        errors = []
-        for error in e.errors():
-            field = '.'.join(str(loc) for loc in error['loc'])
-            message = error['msg']
-            errors.append(f"{field}: {message}")
+        errors = [
+            f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+            for error in e.errors(include_url=False, include_context=False, include_input=False)
+        ]
+
+        # Log summary and first 5 errors in a single record
+        logger.warning(
+            "✗ Validation failed with %d error(s)\n%s",
+            len(errors),
+            "\n".join(f"  - {error}" for error in errors[:5])
+        )
 
-        logger.warning(f"✗ Validation failed with {len(errors)} error(s)")
-        for error in errors[:5]:  # Log first 5 errors
-            logger.warning(f"  - {error}")
+        # Never serve this inference again
+        if state.get('reasoning_cache_key') is not None:
+            _forget_reasoning_result(state['reasoning_cache_key'])
 
         # Update state
-        return {
-            **state,
+        update = {
             'workflow_spec': None,
+            'serialized_spec': None,
             'validation_errors': errors,
             'execution_status': 'error',
             'feedback_messages': errors[:5],  # Use for retry (limit to 5)
             'retry_count': state.get('retry_count', 0) + 1
         }
+        update['next_action'] = 'retry' if should_retry({**state, **update}) else 'escalation'
+        return update
 
     except Exception as e:
         logger.error(f"Validator node failed: {e}")
-        return add_error_to_state(
+        update = add_error_to_state(
             state,
             stage='validator',
             error_type=type(e).__name__,
             message=str(e),
             recoverable=False
         )
+        update['next_action'] = 'escalation'
+        return update
 
 
 # ===== Generator Node (Serialization) =====
@@ -689,32 +1314,37 @@ def generator_node(state: MetaAgentState) -> MetaAgentState:
     Generate final JSON from validated WorkflowSpec.
 
     This node:
-    1. Serializes WorkflowSpec to JSON
-    2. Verifies round-trip consistency
+    1. Takes the JSON serialized by the validator (or serializes WorkflowSpec)
+    2. Verifies round-trip consistency (only with debug logging enabled)
     3. Marks execution as complete
 
     Args:
         state: Current state with workflow_spec
 
     Returns:
-        Updated state with generated_json
+        State update with generated_json
     """
     logger.info("Generator node: Generating final JSON")
 
     try:
-        # Serialize to JSON
-        spec = WorkflowSpec(**state['workflow_spec'])
-        json_output = spec.to_json(indent=2)
-
-        # Verify round-trip consistency
-        parsed_back = WorkflowSpec.from_json(json_output)
-        if parsed_back.to_dict() != state['workflow_spec']:
-            raise ValueError("Round-trip validation failed: JSON serialization produced different structure")
+        # Reuse the validator's serialization; rebuild only for older checkpoints
+        json_output = state.get('serialized_spec')
+        if json_output is None:
+            spec = WorkflowSpec(**state['workflow_spec'])
+            json_output = spec.to_json(indent=2)
+
+        # Verify round-trip consistency. The JSON always comes from the same
+        # validated model as workflow_spec, so this is a debugging aid that
+        # only runs under debug logging. Plain JSON equality covers the usual
+        # case; the Pydantic re-parse only runs when that comparison differs.
+        if logger.isEnabledFor(logging.DEBUG) and _loads_json(json_output) != state['workflow_spec']:
+            parsed_back = WorkflowSpec.from_json(json_output)
+            if parsed_back.to_dict() != state['workflow_spec']:
+                raise ValueError("Round-trip validation failed: JSON serialization produced different structure")
 
         logger.info("✓ Generation complete")
 
         return {
-            **state,
             'generated_json': json_output,
             'execution_status': 'complete'
         }
@@ -745,7 +1375,7 @@ def escalation_node(state: MetaAgentState) -> MetaAgentState:
         state: Current state
 
     Returns:
-        Updated state with execution_status='escalated'
+        State update with execution_status='escalated'
     """
     logger.warning("Escalation node: Preparing for human review")
 
@@ -789,7 +1419,6 @@ def escalation_node(state: MetaAgentState) -> MetaAgentState:
             error_msg += f"\n  - {error}"
 
     return {
-        **state,
         'execution_status': 'escalated',
         'error_message': error_msg
     }
@@ -7,16 +7,79 @@ Includes structured output support for Gemini to ensure valid JSON generation.
 
 import os
 import json
+import time
+import random
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, Iterator, AsyncIterator, Callable
 from abc import ABC, abstractmethod
 
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib codec
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep
+# catching the stdlib exception either way
+_loads_json = orjson.loads if orjson is not None else json.loads
+
+
+def _canonical_json(obj: Any) -> str:
+    """Deterministic (sorted-key) JSON for use as a cache key."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(obj, sort_keys=True)
+
+
+# Connection pool for the OpenAI/Anthropic SDK clients. Idle keep-alive
+# sockets are held for 30s (httpx default: 5s) so consecutive calls of a run
+# - retries, parallel attempts - reuse the TCP/TLS connection.
+_HTTP_POOL_LIMITS = dict(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+def _http_client(use_async: bool = False):
+    """httpx client (sync or async) using the shared pool limits."""
+    import httpx
+    limits = httpx.Limits(**_HTTP_POOL_LIMITS)
+    return httpx.AsyncClient(limits=limits) if use_async else httpx.Client(limits=limits)
+
+
+def _prewarm_enabled() -> bool:
+    """Connection pre-warming is on unless META_FLOW_PREWARM is set to a false value."""
+    return os.getenv("META_FLOW_PREWARM", "1").lower() not in ("0", "false", "no")
+
+
+def _start_prewarm(provider: str, request: Callable[[], Any]) -> None:
+    """
+    Run a cheap request in a daemon thread to open the client's connection.
+
+    The TCP/TLS handshake then happens while the caller is still building
+    prompts, and the first real call reuses the pooled keep-alive socket.
+    Failures are only logged - the real call will surface them.
+    """
+    if not _prewarm_enabled():
+        return
+
+    def run():
+        try:
+            request()
+            logger.debug("Pre-warmed %s connection", provider)
+        except Exception as e:
+            logger.debug("%s connection pre-warm failed: %s", provider, e)
+
+    threading.Thread(target=run, name=f"{provider}-prewarm", daemon=True).start()
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    supports_json_mode: bool = False
+    """Whether generate()/agenerate() accept json_mode=True to request a bare JSON response."""
+
     @abstractmethod
     def generate(
         self,
@@ -42,15 +105,152 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000
+    ) -> str:
+        """
+        Generate completion from LLM without blocking the event loop.
+
+        Providers with an async SDK client override this; the default runs
+        generate() in a worker thread.
+
+        Args:
+            system_prompt: System instructions
+            user_prompt: User message
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Generated text response
+        """
+        return await asyncio.to_thread(
+            self.generate, system_prompt, user_prompt, temperature, max_tokens
+        )
+
+    def is_json_mode_rejection(self, error: Exception) -> bool:
+        """
+        Whether error means the model rejected json_mode=True.
+
+        Callers retry without JSON mode only in that case. Any other failure
+        (auth, rate limits, timeouts) would fail the plain call the same way.
+        """
+        return False
+
+    # Optional streaming API: providers that can stream implement
+    # generate_stream() / agenerate_stream() with generate()'s arguments,
+    # yielding text chunks as they arrive.
+
+    async def abatch_generate(
+        self,
+        requests: List[Tuple[str, str]],
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        max_concurrency: int = 10
+    ) -> List[Any]:
+        """
+        Run many independent completions concurrently.
+
+        All requests are started up front and awaited together; a semaphore
+        caps how many are in flight so provider rate limits aren't hit.
+
+        Args:
+            requests: (system_prompt, user_prompt) pairs
+            temperature: Sampling temperature for every request
+            max_tokens: Maximum tokens to generate per request
+            max_concurrency: Maximum simultaneous API calls
+
+        Returns:
+            One entry per request, in order: the generated text, or the
+            exception that request raised (one failure doesn't cancel the rest)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _generate_one(system_prompt: str, user_prompt: str) -> str:
+            async with semaphore:
+                return await self.agenerate(system_prompt, user_prompt, temperature, max_tokens)
+
+        return await asyncio.gather(
+            *(_generate_one(system_prompt, user_prompt) for system_prompt, user_prompt in requests),
+            return_exceptions=True
+        )
+
     @abstractmethod
     def get_model_name(self) -> str:
         """Get the model identifier."""
         pass
 
 
+def _openai_json_mode(json_mode: bool) -> Dict[str, Any]:
+    """Extra chat.completions.create arguments for OpenAI-compatible JSON mode."""
+    return {'response_format': {'type': 'json_object'}} if json_mode else {}
+
+
+def _gemini_config(
+    system_prompt: str,
+    temperature: float,
+    max_tokens: int,
+    json_mode: bool
+) -> Dict[str, Any]:
+    """Generation config for plain (schema-less) Gemini calls."""
+    config = {
+        'system_instruction': system_prompt,
+        'temperature': temperature,
+        'max_output_tokens': max_tokens
+    }
+    if json_mode:
+        config['response_mime_type'] = 'application/json'
+    return config
+
+
+@lru_cache(maxsize=32)
+def _structured_config(system_prompt: str, schema_json: str, temperature: float):
+    """
+    Gemini structured-output config for a schema given as canonical JSON.
+
+    Building GenerateContentConfig validates the whole schema into the SDK's
+    Schema model; callers pass the same system prompt and workflow schema
+    every time, so the validated config is reused instead of rebuilt per call.
+    """
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        system_instruction=system_prompt,
+        response_mime_type="application/json",
+        response_schema=_loads_json(schema_json),
+        temperature=temperature
+    )
+
+
+def _check_structured_json(response) -> None:
+    """
+    Make sure a Gemini structured-output response holds valid JSON.
+
+    When the SDK has already decoded the text into response.parsed it is
+    known to be valid, so the extra full parse is skipped.
+
+    Raises:
+        ValueError: If the response text is not valid JSON
+    """
+    if getattr(response, 'parsed', None) is not None:
+        return
+    try:
+        _loads_json(response.text)  # This should never fail with structured output
+        logger.debug("Structured output generated valid JSON")
+    except json.JSONDecodeError as e:
+        error_msg = f"Gemini returned invalid JSON despite structured output: {e}"
+        logger.error(error_msg)
+        raise ValueError(error_msg) from e
+
+
 class AIMLAPIProvider(LLMProvider):
     """AIMLAPI provider using OpenAI-compatible interface."""
 
+    supports_json_mode = True
+
     def __init__(self, model: str = "x-ai/grok-4-fast-reasoning"):
         """
         Initialize AIMLAPI provider.
@@ -73,20 +273,35 @@ class AIMLAPIProvider(LLMProvider):
         from openai import OpenAI
         self._client = OpenAI(
             api_key=self.api_key,
-            base_url="https://api.aimlapi.com/v1"
+            base_url="https://api.aimlapi.com/v1",
+            http_client=_http_client()
         )
+        self._async_client = None
+        _start_prewarm("AIMLAPI", self._client.models.list)
 
         logger.info(f"Initialized AIMLAPI provider with model: {model}")
 
+    def _get_async_client(self):
+        """Create the async client on first use and cache it."""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url="https://api.aimlapi.com/v1",
+                http_client=_http_client(use_async=True)
+            )
+        return self._async_client
+
     def generate(
         self,
         system_prompt: str,
         user_prompt: str,
         temperature: float = 0.1,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        json_mode: bool = False
     ) -> str:
-        """Generate completion using AIMLAPI."""
-        logger.debug(f"Calling AIMLAPI with model: {self.model}")
+        """Generate completion using AIMLAPI (json_mode sets response_format=json_object)."""
+        logger.debug("Calling AIMLAPI with model: %s", self.model)
 
         # Use cached client
         response = self._client.chat.completions.create(
@@ -96,7 +311,8 @@ class AIMLAPIProvider(LLMProvider):
                 {"role": "user", "content": user_prompt}
             ],
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            **_openai_json_mode(json_mode)
         )
 
         if not response.choices or not response.choices[0].message.content:
@@ -104,14 +320,155 @@ class AIMLAPIProvider(LLMProvider):
 
         return response.choices[0].message.content.strip()
 
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        json_mode: bool = False
+    ) -> str:
+        """Generate completion using AIMLAPI's async client."""
+        logger.debug("Calling AIMLAPI (async) with model: %s", self.model)
+
+        response = await self._get_async_client().chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **_openai_json_mode(json_mode)
+        )
+
+        if not response.choices or not response.choices[0].message.content:
+            raise ValueError("AIMLAPI returned empty response")
+
+        return response.choices[0].message.content.strip()
+
+    def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        json_mode: bool = False
+    ) -> Iterator[str]:
+        """
+        Stream a completion from AIMLAPI as text chunks.
+
+        Lets callers inspect the response while it is still being generated
+        and stop early (closing the generator closes the HTTP stream).
+
+        Raises:
+            ValueError: If the stream produced no content
+        """
+        logger.debug("Streaming AIMLAPI with model: %s", self.model)
+
+        stream = self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **_openai_json_mode(json_mode)
+        )
+
+        produced = False
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    produced = True
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+
+        if not produced:
+            raise ValueError("AIMLAPI returned empty response")
+
+    async def agenerate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """Async counterpart of generate_stream, using the async client."""
+        logger.debug("Streaming AIMLAPI (async) with model: %s", self.model)
+
+        stream = await self._get_async_client().chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **_openai_json_mode(json_mode)
+        )
+
+        produced = False
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    produced = True
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+        if not produced:
+            raise ValueError("AIMLAPI returned empty response")
+
+    def is_json_mode_rejection(self, error: Exception) -> bool:
+        """A 400 Bad Request: the model doesn't accept response_format."""
+        from openai import BadRequestError
+
+        return isinstance(error, BadRequestError)
+
     def get_model_name(self) -> str:
         """Get model name."""
         return f"aimlapi:{self.model}"
 
 
+# Gemini retries for rate limits / overload / server errors
+_GEMINI_MAX_ATTEMPTS = 4
+_GEMINI_TRANSIENT_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _log_gemini_cache_usage(response):
+    """Debug-log how much of the prompt Gemini served from its implicit cache."""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is not None and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Gemini prompt tokens: {usage.prompt_token_count}, "
+            f"cached: {usage.cached_content_token_count or 0}"
+        )
+    return response
+
+
+def _is_transient_gemini_error(error: Exception) -> bool:
+    """Whether a google-genai error is worth retrying."""
+    from google.genai import errors
+
+    return isinstance(error, errors.APIError) and error.code in _GEMINI_TRANSIENT_CODES
+
+
+def _backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
 class GeminiProvider(LLMProvider):
     """Google Gemini provider with structured output support."""
 
+    supports_json_mode = True
+
     def __init__(self, model: Optional[str] = None):
         """
         Initialize Gemini provider.
@@ -136,30 +493,56 @@ class GeminiProvider(LLMProvider):
         # Initialize client once (cache it)
         from google import genai
         self._client = genai.Client(api_key=self.api_key)
+        _start_prewarm("Gemini", lambda: self._client.models.list(config={'page_size': 1}))
 
         logger.info(f"Initialized Gemini provider with model: {self.model}")
 
+    def _generate_content(self, **kwargs):
+        """
+        Call models.generate_content, retrying rate limits and server errors.
+
+        The OpenAI and Anthropic SDKs back off on these themselves; the
+        Gemini client doesn't, so transient failures would otherwise surface
+        as failed reasoning attempts.
+        """
+        for attempt in range(_GEMINI_MAX_ATTEMPTS):
+            try:
+                return _log_gemini_cache_usage(self._client.models.generate_content(**kwargs))
+            except Exception as e:
+                if attempt + 1 == _GEMINI_MAX_ATTEMPTS or not _is_transient_gemini_error(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"Gemini call failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    async def _agenerate_content(self, **kwargs):
+        """Async version of _generate_content."""
+        for attempt in range(_GEMINI_MAX_ATTEMPTS):
+            try:
+                return _log_gemini_cache_usage(await self._client.aio.models.generate_content(**kwargs))
+            except Exception as e:
+                if attempt + 1 == _GEMINI_MAX_ATTEMPTS or not _is_transient_gemini_error(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"Gemini call failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
     def generate(
         self,
         system_prompt: str,
         user_prompt: str,
         temperature: float = 0.1,
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        json_mode: bool = False
     ) -> str:
-        """Generate completion using Gemini."""
-        logger.debug(f"Calling Gemini with model: {self.model}")
-
-        # Build prompt with system instruction
-        full_prompt = f"{system_prompt}\n\n{user_prompt}"
+        """Generate completion using Gemini (json_mode sets an application/json response type)."""
+        logger.debug("Calling Gemini with model: %s", self.model)
 
         # Generate response using cached client
-        response = self._client.models.generate_content(
+        response = self._generate_content(
             model=self.model,
-            contents=full_prompt,
-            config={
-                'temperature': temperature,
-                'max_output_tokens': max_tokens
-            }
+            contents=user_prompt,
+            config=_gemini_config(system_prompt, temperature, max_tokens, json_mode)
         )
 
         if not response or not response.text:
@@ -169,6 +552,108 @@ class GeminiProvider(LLMProvider):
 
         return response.text.strip()
 
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        json_mode: bool = False
+    ) -> str:
+        """Generate completion using Gemini's async client."""
+        logger.debug("Calling Gemini (async) with model: %s", self.model)
+
+        # The cached client exposes its async API under .aio
+        response = await self._agenerate_content(
+            model=self.model,
+            contents=user_prompt,
+            config=_gemini_config(system_prompt, temperature, max_tokens, json_mode)
+        )
+
+        if not response or not response.text:
+            error_msg = "Gemini returned empty response"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        return response.text.strip()
+
+    def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        json_mode: bool = False
+    ) -> Iterator[str]:
+        """
+        Stream a completion from Gemini as text chunks.
+
+        Transient errors are retried like _generate_content as long as
+        nothing has been yielded yet.
+        """
+        logger.debug("Streaming Gemini with model: %s", self.model)
+
+        produced = False
+        for attempt in range(_GEMINI_MAX_ATTEMPTS):
+            try:
+                for chunk in self._client.models.generate_content_stream(
+                    model=self.model,
+                    contents=user_prompt,
+                    config=_gemini_config(system_prompt, temperature, max_tokens, json_mode)
+                ):
+                    if chunk.text:
+                        produced = True
+                        yield chunk.text
+                break
+            except Exception as e:
+                if produced or attempt + 1 == _GEMINI_MAX_ATTEMPTS or not _is_transient_gemini_error(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"Gemini stream failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        if not produced:
+            raise ValueError("Gemini returned empty response")
+
+    async def agenerate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """Async counterpart of generate_stream, using the client's .aio API."""
+        logger.debug("Streaming Gemini (async) with model: %s", self.model)
+
+        produced = False
+        for attempt in range(_GEMINI_MAX_ATTEMPTS):
+            try:
+                async for chunk in await self._client.aio.models.generate_content_stream(
+                    model=self.model,
+                    contents=user_prompt,
+                    config=_gemini_config(system_prompt, temperature, max_tokens, json_mode)
+                ):
+                    if chunk.text:
+                        produced = True
+                        yield chunk.text
+                break
+            except Exception as e:
+                if produced or attempt + 1 == _GEMINI_MAX_ATTEMPTS or not _is_transient_gemini_error(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"Gemini stream failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        if not produced:
+            raise ValueError("Gemini returned empty response")
+
+    def is_json_mode_rejection(self, error: Exception) -> bool:
+        """A 400 client error: the model doesn't accept response_mime_type."""
+        from google.genai import errors
+
+        return isinstance(error, errors.ClientError) and error.code == 400
+
     def get_model_name(self) -> str:
         """Get model name."""
         return f"gemini:{self.model}"
@@ -197,24 +682,18 @@ class GeminiProvider(LLMProvider):
         Raises:
             Exception: If API call fails or structured output not supported
         """
-        from google.genai import types
-
-        logger.debug(f"Calling Gemini structured output with model: {self.model}")
-        logger.debug(f"Schema keys: {list(response_schema.keys())}")
-
-        # Build prompt with system instruction
-        full_prompt = f"{system_prompt}\n\n{user_prompt}"
+        logger.debug("Calling Gemini structured output with model: %s", self.model)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Schema keys: %s", list(response_schema))
 
         try:
             # Generate with structured output using cached client
             # GenerateContentConfig does not support max_token_count parameter
-            response = self._client.models.generate_content(
+            response = self._generate_content(
                 model=self.model,
-                contents=full_prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=response_schema,
-                    temperature=temperature
+                contents=user_prompt,
+                config=_structured_config(
+                    system_prompt, _canonical_json(response_schema), temperature
                 )
             )
 
@@ -224,13 +703,7 @@ class GeminiProvider(LLMProvider):
                 raise ValueError(error_msg)
 
             # Validate JSON before returning
-            try:
-                json.loads(response.text)  # This should never fail with structured output
-                logger.debug("Structured output generated valid JSON")
-            except json.JSONDecodeError as e:
-                error_msg = f"Gemini returned invalid JSON despite structured output: {e}"
-                logger.error(error_msg)
-                raise ValueError(error_msg) from e
+            _check_structured_json(response)
 
             return response.text.strip()
 
@@ -239,16 +712,49 @@ class GeminiProvider(LLMProvider):
             # Don't fall back silently - raise the error so caller knows
             raise
 
+    async def agenerate_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_schema: Dict[str, Any],
+        temperature: float = 0.05,
+        max_tokens: int = 4000
+    ) -> str:
+        """Async version of generate_structured, using the client's .aio API."""
+        logger.debug("Calling Gemini structured output (async) with model: %s", self.model)
+
+        response = await self._agenerate_content(
+            model=self.model,
+            contents=user_prompt,
+            config=_structured_config(
+                system_prompt, _canonical_json(response_schema), temperature
+            )
+        )
+
+        if not response or not response.text:
+            error_msg = "Gemini structured output returned empty response"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        _check_structured_json(response)
+
+        return response.text.strip()
+
+
+# Rough lower bound for a cacheable Claude system prompt (~1024 tokens)
+_CLAUDE_CACHE_MIN_CHARS = 4096
+
 
 class ClaudeProvider(LLMProvider):
     """Anthropic Claude provider with excellent JSON generation reliability."""
 
-    def __init__(self, model: Optional[str] = None):
+    def __init__(self, model: Optional[str] = None, prompt_caching: bool = True):
         """
         Initialize Claude provider.
 
         Args:
             model: Model identifier (default: from ANTHROPIC_MODEL env var or claude-3-5-sonnet-20241022)
+            prompt_caching: Mark long system prompts for Anthropic prompt caching
 
         Raises:
             ValueError: If ANTHROPIC_API_KEY environment variable is not set
@@ -262,16 +768,19 @@ class ClaudeProvider(LLMProvider):
 
         # Use provided model, or env var, or default to Haiku 4.5
         self.model = model or os.getenv('ANTHROPIC_MODEL', 'claude-haiku-4-5')
+        self.prompt_caching = prompt_caching
 
         # Initialize client once (cache it)
         try:
             from anthropic import Anthropic
-            self._client = Anthropic(api_key=self.api_key)
+            self._client = Anthropic(api_key=self.api_key, http_client=_http_client())
         except ImportError:
             raise ImportError(
                 "anthropic package not installed\n"
                 "Install: pip install anthropic"
             )
+        self._async_client = None
+        _start_prewarm("Claude", lambda: self._client.models.list(limit=1))
 
         logger.info(f"Initialized Claude provider with model: {self.model}")
 
@@ -283,13 +792,13 @@ class ClaudeProvider(LLMProvider):
         max_tokens: int = 4000
     ) -> str:
         """Generate completion using Claude."""
-        logger.debug(f"Calling Claude with model: {self.model}")
+        logger.debug("Calling Claude with model: %s", self.model)
 
         try:
             # Use cached client to create message
             response = self._client.messages.create(
                 model=self.model,
-                system=system_prompt,
+                system=self._system_param(system_prompt),
                 messages=[
                     {"role": "user", "content": user_prompt}
                 ],
@@ -308,6 +817,114 @@ class ClaudeProvider(LLMProvider):
             logger.error(f"Claude API call failed: {e}")
             raise
 
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000
+    ) -> str:
+        """Generate completion using Claude's async client."""
+        logger.debug("Calling Claude (async) with model: %s", self.model)
+
+        try:
+            response = await self._get_async_client().messages.create(
+                model=self.model,
+                system=self._system_param(system_prompt),
+                messages=[
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+
+            if not response.content or not response.content[0].text:
+                error_msg = "Claude returned empty response"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+
+            return response.content[0].text.strip()
+
+        except Exception as e:
+            logger.error(f"Claude API call failed: {e}")
+            raise
+
+    def generate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000
+    ) -> Iterator[str]:
+        """Stream a completion from Claude as text chunks."""
+        logger.debug("Streaming Claude with model: %s", self.model)
+
+        produced = False
+        with self._client.messages.stream(
+            model=self.model,
+            system=self._system_param(system_prompt),
+            messages=[
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        ) as stream:
+            for text in stream.text_stream:
+                if text:
+                    produced = True
+                    yield text
+
+        if not produced:
+            raise ValueError("Claude returned empty response")
+
+    async def agenerate_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000
+    ) -> AsyncIterator[str]:
+        """Async counterpart of generate_stream, using the async client."""
+        logger.debug("Streaming Claude (async) with model: %s", self.model)
+
+        produced = False
+        async with self._get_async_client().messages.stream(
+            model=self.model,
+            system=self._system_param(system_prompt),
+            messages=[
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        ) as stream:
+            async for text in stream.text_stream:
+                if text:
+                    produced = True
+                    yield text
+
+        if not produced:
+            raise ValueError("Claude returned empty response")
+
+    def _get_async_client(self):
+        """Create the async client on first use and cache it."""
+        if self._async_client is None:
+            from anthropic import AsyncAnthropic
+            self._async_client = AsyncAnthropic(
+                api_key=self.api_key, http_client=_http_client(use_async=True)
+            )
+        return self._async_client
+
+    def _system_param(self, system_prompt: str):
+        """
+        System prompt, as a cacheable content block when long enough.
+
+        Anthropic only caches prefixes above a per-model minimum (1024-2048
+        tokens), so shorter prompts are sent as a plain string.
+        """
+        if not self.prompt_caching or len(system_prompt) < _CLAUDE_CACHE_MIN_CHARS:
+            return system_prompt
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
     def get_model_name(self) -> str:
         """Get model name."""
         return f"claude:{self.model}"
@@ -339,73 +956,98 @@ class ClaudeProvider(LLMProvider):
         Raises:
             ValueError: If JSON generation fails after retry
         """
-        logger.debug(f"Generating JSON with Claude model: {self.model}")
-
-        # Enhance prompts for JSON generation
-        json_system = f"""{system_prompt}
-
-IMPORTANT: You MUST respond with valid JSON only. Do not include any explanatory text, markdown formatting, or code blocks. Just the raw JSON object."""
-
-        json_user = f"""{user_prompt}
-
-Remember: Respond ONLY with a valid JSON object. No other text."""
+        logger.debug("Generating JSON with Claude model: %s", self.model)
+        json_system, json_user = _claude_json_prompts(system_prompt, user_prompt)
 
         # First attempt
         response = self.generate(json_system, json_user, temperature, max_tokens)
-
-        # Try to parse the JSON
         try:
-            # Clean up common issues
-            cleaned = response.strip()
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            if cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
-
-            # Validate JSON
-            json.loads(cleaned)
-            logger.debug("Claude generated valid JSON on first attempt")
-            return cleaned
-
+            return _validated_claude_json(response, retry=False)
         except json.JSONDecodeError as e:
-            logger.warning(f"First JSON generation attempt failed: {e}")
-
             if not retry_on_invalid:
                 raise ValueError(f"Claude generated invalid JSON: {e}") from e
 
             # Retry with error feedback
             logger.debug("Retrying with error feedback")
-            retry_prompt = f"""The previous JSON generation failed with error:
-{str(e)}
+            retry_response = self.generate(
+                json_system, _claude_json_retry_prompt(e, user_prompt), temperature, max_tokens
+            )
+            return _validated_claude_json(retry_response, retry=True)
+
+    async def agenerate_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+        retry_on_invalid: bool = True
+    ) -> str:
+        """Async version of generate_json, using the async client."""
+        logger.debug("Generating JSON (async) with Claude model: %s", self.model)
+        json_system, json_user = _claude_json_prompts(system_prompt, user_prompt)
+
+        response = await self.agenerate(json_system, json_user, temperature, max_tokens)
+        try:
+            return _validated_claude_json(response, retry=False)
+        except json.JSONDecodeError as e:
+            if not retry_on_invalid:
+                raise ValueError(f"Claude generated invalid JSON: {e}") from e
+
+            logger.debug("Retrying with error feedback")
+            retry_response = await self.agenerate(
+                json_system, _claude_json_retry_prompt(e, user_prompt), temperature, max_tokens
+            )
+            return _validated_claude_json(retry_response, retry=True)
+
+
+def _claude_json_prompts(system_prompt: str, user_prompt: str) -> Tuple[str, str]:
+    """Wrap the prompts with Claude's JSON-only instructions."""
+    json_system = f"""{system_prompt}
+
+IMPORTANT: You MUST respond with valid JSON only. Do not include any explanatory text, markdown formatting, or code blocks. Just the raw JSON object."""
+
+    json_user = f"""{user_prompt}
+
+Remember: Respond ONLY with a valid JSON object. No other text."""
+
+    return json_system, json_user
+
+
+def _claude_json_retry_prompt(error: json.JSONDecodeError, user_prompt: str) -> str:
+    """User prompt for the retry after Claude produced invalid JSON."""
+    return f"""The previous JSON generation failed with error:
+{str(error)}
 
 Original request:
 {user_prompt}
 
 Please generate the correct JSON object. Remember: ONLY valid JSON, no other text."""
 
-            retry_response = self.generate(json_system, retry_prompt, temperature, max_tokens)
 
-            # Clean and validate retry
-            cleaned_retry = retry_response.strip()
-            if cleaned_retry.startswith("```json"):
-                cleaned_retry = cleaned_retry[7:]
-            if cleaned_retry.startswith("```"):
-                cleaned_retry = cleaned_retry[3:]
-            if cleaned_retry.endswith("```"):
-                cleaned_retry = cleaned_retry[:-3]
-            cleaned_retry = cleaned_retry.strip()
+def _validated_claude_json(response: str, retry: bool) -> str:
+    """
+    Strip code fences from a Claude response and check that it parses.
 
-            try:
-                json.loads(cleaned_retry)
-                logger.debug("Claude generated valid JSON on retry")
-                return cleaned_retry
-            except json.JSONDecodeError as e2:
-                error_msg = f"Claude failed to generate valid JSON after retry: {e2}"
-                logger.error(error_msg)
-                raise ValueError(error_msg) from e2
+    Raises:
+        json.JSONDecodeError: If the first attempt is not valid JSON
+        ValueError: If the retry is not valid JSON either
+    """
+    # Clean up common issues (markdown code fences)
+    cleaned = response.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
+    # Validate JSON
+    try:
+        _loads_json(cleaned)
+    except json.JSONDecodeError as e:
+        if not retry:
+            logger.warning(f"First JSON generation attempt failed: {e}")
+            raise
+        error_msg = f"Claude failed to generate valid JSON after retry: {e}"
+        logger.error(error_msg)
+        raise ValueError(error_msg) from e
+
+    logger.debug("Claude generated valid JSON %s", "on retry" if retry else "on first attempt")
+    return cleaned
 
 
 def create_provider(provider_name: str, model: Optional[str] = None) -> LLMProvider:
@@ -5,12 +5,83 @@ This module provides utilities to convert Pydantic models (like WorkflowSpec)
 to JSON Schema format for use with Gemini's structured output mode.
 """
 
-from typing import Type, Any, Dict, List, Union
+from typing import Type, Any, Dict, List, Optional, Tuple, Union
+from functools import lru_cache
 from pydantic import BaseModel
+import os
+import re
+import copy
+import json
 import logging
 
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Built workflow schemas keyed by model class (see generate_workflow_schema)
+_WORKFLOW_SCHEMA_CACHE: Dict[type, Dict[str, Any]] = {}
+
+# Raw model_json_schema() output keyed by model class (see pydantic_to_json_schema)
+_MODEL_SCHEMA_CACHE: Dict[type, Dict[str, Any]] = {}
+
+# Plain text or properly formatted {{name}} variable references, shared by
+# every string schema that gets a pattern
+VARIABLE_REF_PATTERN = r"^([^{]|\{\{[a-z_][a-z0-9_]*\}\})*$"
+
+# Description keywords marking strings that may contain variable references
+_VAR_KEYWORD_RE = re.compile(r"variable|reference|parameter|assigns", re.IGNORECASE)
+
+# Keys whose values are never rewritten by the variable-pattern pass
+_PATTERN_SKIP_KEYS = frozenset(("pattern", "description"))
+
+# Stand-in for $refs that can't be resolved against $defs. This should be an
+# object type since it's a workflow node; no transform pass rewrites it.
+_REF_PLACEHOLDER = {
+    "type": "object",
+    "properties": {
+        "type": {"type": "string", "description": "Workflow node type"}
+    },
+    "description": "Workflow node (reference resolved)"
+}
+
+# Schema keys with dedicated handling in _transform_schema; any other key is
+# transformed as a plain child
+_DROP_KEY = "drop"
+_PROPERTIES_KEY = "properties"
+_ITEMS_KEY = "items"
+_COMPOSITION_KEY = "composition"
+_DEFS_KEY = "defs"
+_TRANSFORM_KEY_KINDS = {
+    "additionalProperties": _DROP_KEY,
+    "properties": _PROPERTIES_KEY,
+    "items": _ITEMS_KEY,
+    "anyOf": _COMPOSITION_KEY,
+    "oneOf": _COMPOSITION_KEY,
+    "allOf": _COMPOSITION_KEY,
+    "$defs": _DEFS_KEY,
+    "definitions": _DEFS_KEY,
+}
+
+# Scalar types that must never carry 'properties'
+_PRIMITIVE_TYPES = frozenset(("string", "number", "integer", "boolean", "null"))
+
+# Parent-context tags recorded by validate_schema_for_gemini for child nodes
+_UNION_KEYS = frozenset(("anyOf", "oneOf", "allOf"))
+_VALIDATE_PARENT_TYPES = {
+    "anyOf": "anyOf",
+    "oneOf": "oneOf",
+    "allOf": "allOf",
+    "properties": "object_properties",
+    "items": "array_items",
+}
+
+# Mark finish and memo frames on the _transform_schema work stack
+_FINISH = object()
+_MEMO = object()
+
 
 def pydantic_to_json_schema(model: Type[BaseModel], max_depth: int = 3) -> Dict[str, Any]:
     """
@@ -21,23 +92,24 @@ def pydantic_to_json_schema(model: Type[BaseModel], max_depth: int = 3) -> Dict[
         max_depth: Maximum recursion depth for nested models (default 3)
 
     Returns:
-        JSON Schema dictionary
+        JSON Schema dictionary. Repeated expansions of the same $defs entry
+        share nested dicts, so copy a node before mutating it in place.
     """
     try:
-        # Get base schema from Pydantic
-        schema = model.model_json_schema()
+        # Get base schema from Pydantic. Generating it costs far more than
+        # copying it; the copy keeps the cached base away from callers, as
+        # converted schemas reuse nodes of the base schema.
+        base = _MODEL_SCHEMA_CACHE.get(model)
+        if base is None:
+            base = _MODEL_SCHEMA_CACHE[model] = model.model_json_schema()
+        schema = copy.deepcopy(base)
 
         # Extract definitions for reference resolution
         defs = schema.get("$defs", {})
 
-        # Apply Gemini-specific constraints with definitions for reference resolution
-        schema = _apply_gemini_constraints(schema, max_depth, defs=defs)
-
-        # Add variable reference patterns
-        schema = _add_variable_patterns(schema)
-
-        # Simplify complex unions if needed
-        schema = _simplify_unions(schema)
+        # Apply Gemini constraints, variable reference patterns and union
+        # simplification in a single traversal
+        schema = _transform_schema(schema, max_depth, defs=defs)
 
         logger.debug(f"Generated JSON schema for {model.__name__}")
         return schema
@@ -57,134 +129,11 @@ def _apply_gemini_constraints(schema: Dict[str, Any], max_depth: int, current_de
 
     Depth is only incremented when entering properties of object-type schemas.
     """
-    # Handle non-dict types (shouldn't happen but be defensive)
-    if not isinstance(schema, dict):
-        return schema
-
-    # Handle $ref references first (Gemini doesn't support them)
-    if "$ref" in schema:
-        # Try to resolve the reference
-        if defs:
-            ref_path = schema["$ref"]
-            if ref_path.startswith("#/$defs/"):
-                ref_name = ref_path.replace("#/$defs/", "")
-                if ref_name in defs:
-                    # Inline the referenced schema and process it
-                    referenced_schema = defs[ref_name].copy()
-                    return _apply_gemini_constraints(referenced_schema, max_depth, current_depth, defs)
-
-        # If we can't resolve, use a placeholder with proper properties based on context
-        # This should be an object type since it's a workflow node
-        return {
-            "type": "object",
-            "properties": {
-                "type": {"type": "string", "description": "Workflow node type"}
-            },
-            "description": "Workflow node (reference resolved)"
-        }
-
-    # Determine the schema type
-    schema_type = schema.get("type")
-    is_object_type = False
-
-    if isinstance(schema_type, list):
-        # Union type like ["object", "null"]
-        is_object_type = "object" in schema_type
-    elif schema_type == "object":
-        is_object_type = True
-
-    # Only apply depth limit to actual object types
-    if is_object_type and current_depth >= max_depth:
-        # Return a simple object schema without properties
-        # Gemini doesn't like empty properties, so we omit them entirely
-        return {
-            "type": "object",
-            "description": f"Nested object (depth limit {max_depth} reached)"
-        }
-
-    # For primitive types, preserve the schema but remove unsupported fields
-    primitive_types = ["string", "number", "integer", "boolean", "null", "array"]
-    is_primitive = schema_type in primitive_types or (
-        isinstance(schema_type, list) and
-        all(t in primitive_types for t in schema_type)
+    return _transform_schema(
+        schema, max_depth, current_depth, defs,
+        constrain=True, patterns=False, simplify=False
     )
 
-    # Build result dict
-    result = {}
-
-    for key, value in schema.items():
-        # Skip Gemini-unsupported fields
-        if key == "additionalProperties":
-            # Log for debugging but don't include
-            if value not in [False, True]:
-                logger.debug(f"Skipping additionalProperties with value: {value}")
-            continue
-
-        # Process based on key type
-        if key == "properties" and isinstance(value, dict):
-            # Only increment depth if this is an object type's properties
-            if is_object_type:
-                # Entering object properties - increment depth
-                result[key] = {}
-                for prop_name, prop_schema in value.items():
-                    result[key][prop_name] = _apply_gemini_constraints(
-                        prop_schema, max_depth, current_depth + 1, defs
-                    )
-            else:
-                # Non-object shouldn't have properties, but handle gracefully
-                logger.warning(f"Non-object type {schema_type} has properties - preserving")
-                result[key] = {}
-                for prop_name, prop_schema in value.items():
-                    result[key][prop_name] = _apply_gemini_constraints(
-                        prop_schema, max_depth, current_depth, defs
-                    )
-
-        elif key == "items":
-            # Array items - check if items are objects
-            if isinstance(value, dict):
-                item_type = value.get("type")
-                # Only increment depth if array contains objects
-                if item_type == "object" or (isinstance(item_type, list) and "object" in item_type):
-                    next_depth = current_depth + 1
-                else:
-                    next_depth = current_depth
-                result[key] = _apply_gemini_constraints(value, max_depth, next_depth, defs)
-            elif isinstance(value, list):
-                # Array of schemas (tuple validation)
-                result[key] = [
-                    _apply_gemini_constraints(item, max_depth, current_depth, defs)
-                    if isinstance(item, dict) else item
-                    for item in value
-                ]
-            else:
-                result[key] = value
-
-        elif key in ["anyOf", "oneOf", "allOf"] and isinstance(value, list):
-            # Union/composition operators - don't increment depth
-            result[key] = [
-                _apply_gemini_constraints(item, max_depth, current_depth, defs)
-                if isinstance(item, dict) else item
-                for item in value
-            ]
-
-        elif key in ["$defs", "definitions"] and isinstance(value, dict):
-            # Schema definitions - process without incrementing depth
-            result[key] = {}
-            for def_name, def_schema in value.items():
-                result[key][def_name] = _apply_gemini_constraints(
-                    def_schema, max_depth, current_depth, defs
-                )
-
-        elif isinstance(value, dict):
-            # Other nested dicts - don't increment depth (metadata, etc.)
-            result[key] = _apply_gemini_constraints(value, max_depth, current_depth, defs)
-
-        else:
-            # Primitive values, strings, numbers, etc.
-            result[key] = value
-
-    return result
-
 
 def _add_variable_patterns(schema: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -192,30 +141,10 @@ def _add_variable_patterns(schema: Dict[str, Any]) -> Dict[str, Any]:
 
     Ensures variables follow the {{name}} pattern, not {{{{name}}}} or {{name.property}}.
     """
-    def add_pattern(obj: Any) -> Any:
-        if isinstance(obj, dict):
-            # If it's a string type that might contain variable references
-            if obj.get("type") == "string":
-                # Check if description suggests it might contain variables
-                desc = obj.get("description", "").lower()
-                if any(word in desc for word in ["variable", "reference", "parameter", "assigns"]):
-                    # Add pattern to ensure proper variable format
-                    if "pattern" not in obj:
-                        # Allow either plain text or properly formatted variables
-                        obj["pattern"] = r"^([^{]|\{\{[a-z_][a-z0-9_]*\}\})*$"
-                        obj["description"] = f"{obj.get('description', '')} (use {{name}} format for variables)"
-
-            # Recursively process nested objects
-            for key, value in obj.items():
-                if key not in ["pattern", "description"]:  # Don't recurse into these
-                    obj[key] = add_pattern(value)
-
-        elif isinstance(obj, list):
-            return [add_pattern(item) for item in obj]
-
-        return obj
-
-    return add_pattern(schema)
+    return _transform_schema(
+        schema, 0, 0, None,
+        constrain=False, patterns=True, simplify=False
+    )
 
 
 def _simplify_unions(schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -225,64 +154,345 @@ def _simplify_unions(schema: Dict[str, Any]) -> Dict[str, Any]:
     Gemini sometimes struggles with complex anyOf/oneOf constructs.
     This simplifies them where possible.
     """
-    def simplify(obj: Any) -> Any:
-        if isinstance(obj, dict):
-            # Handle anyOf with simple types
-            if "anyOf" in obj and len(obj["anyOf"]) == 2:
-                types = [item.get("type") for item in obj["anyOf"]]
-                if "null" in types:
-                    # Optional field - just use the non-null type
-                    non_null_items = [item for item in obj["anyOf"] if item.get("type") != "null"]
-                    if non_null_items:
-                        return simplify(non_null_items[0])
-                    # If all items are null, return the original object
-                    return obj
-
-            # Handle oneOf similarly
-            if "oneOf" in obj:
-                # For workflow types, convert to enum if possible
-                if all(item.get("type") == "object" for item in obj["oneOf"]):
-                    # Keep the oneOf but add discriminator hint
-                    obj["discriminator"] = {"propertyName": "type"}
-
-            # Recursively process
-            return {key: simplify(value) for key, value in obj.items()}
+    return _transform_schema(
+        schema, 0, 0, None,
+        constrain=False, patterns=False, simplify=True
+    )
 
-        elif isinstance(obj, list):
-            return [simplify(item) for item in obj]
 
-        return obj
+def _transform_schema(
+    obj: Any,
+    max_depth: int,
+    current_depth: int = 0,
+    defs: Dict[str, Any] = None,
+    constrain: bool = True,
+    patterns: bool = True,
+    simplify: bool = True
+) -> Any:
+    """
+    Single-pass schema transform fusing the three conversion passes.
+
+    Each dict node is rebuilt exactly once, applying in order:
+    - constrain: Gemini constraints ($ref inlining, additionalProperties
+      removal, object depth limit) - see _apply_gemini_constraints
+    - patterns: variable reference patterns - see _add_variable_patterns
+    - simplify: Optional (anyOf with null) collapse and oneOf
+      discriminator hints - see _simplify_unions
+
+    Children are transformed before the node's own pattern/union rewrites,
+    which only look at the node and its direct (already final) children.
+    Subtrees that a pass would not visit are transformed with that pass's
+    flag switched off.
+
+    The walk uses an explicit stack instead of recursion: visit frames
+    write their result into a slot of the parent's result, and a finish
+    frame pushed below a node's children applies the node-local rewrites
+    once all children are done. Nodes that no rewrite can change (not a
+    pattern-eligible string, no anyOf/oneOf) skip the finish frame.
+    """
+    root = [None]
+    # Visit frames: (obj, depth, constrain, patterns, slot, key)
+    # Finish frames: (_FINISH, node, patterns, slot, key)
+    # Memo frames: (_MEMO, memo_key, slot, key)
+    stack = [(obj, current_depth, constrain, patterns, root, 0)]
+
+    # Transformed $defs expansions for this conversion. An expansion depends
+    # only on the definition, depth and pattern flag, so repeated references
+    # (e.g. every union arm pointing at the same node type) are built once.
+    ref_memo = {}
+
+    def push_finish(source, node, node_patterns, slot, key):
+        # Only queue the node-local rewrites when one of them can apply;
+        # otherwise the node already sitting in its slot is final
+        if _may_rewrite(source, node_patterns, simplify):
+            stack.append((_FINISH, node, node_patterns, slot, key))
+
+    def push_container(container, depth, container_patterns, slot, key):
+        # Name -> schema mapping such as 'properties' or '$defs'
+        result = dict.fromkeys(container)
+        slot[key] = result
+        push_finish(container, result, container_patterns, slot, key)
+        # The $defs being inlined: each entry is built exactly like a $ref
+        # expansion at this depth, so entries and expansions share ref_memo
+        is_defs = container is defs
+        for name, sub_schema in container.items():
+            name_patterns = container_patterns and name not in _PATTERN_SKIP_KEYS
+            if is_defs:
+                memo_key = (name, depth, name_patterns)
+                if memo_key in ref_memo:
+                    result[name] = ref_memo[memo_key]
+                    continue
+                stack.append((_MEMO, memo_key, result, name))
+            stack.append((sub_schema, depth, True, name_patterns, result, name))
+
+    def push_items(items, depth, item_patterns, slot, key, constrain_dicts):
+        result = [None] * len(items)
+        slot[key] = result
+        for index, item in enumerate(items):
+            stack.append((
+                item, depth, constrain_dicts and isinstance(item, dict),
+                item_patterns, result, index
+            ))
+
+    while stack:
+        frame = stack.pop()
+
+        if frame[0] is _FINISH:
+            _, node, node_patterns, slot, key = frame
+            slot[key] = _finish_node(node, node_patterns, simplify)
+            continue
+
+        if frame[0] is _MEMO:
+            _, memo_key, slot, key = frame
+            ref_memo[memo_key] = slot[key]
+            continue
+
+        obj, depth, constrain, patterns, slot, key = frame
 
-    return simplify(schema)
+        if isinstance(obj, list):
+            if _is_flat(obj):
+                # Lists of scalars (enum, required, ...) can't change; reuse them
+                slot[key] = obj
+                continue
+            # Constraints only descend into lists under composition keys (handled below)
+            push_items(obj, depth, patterns, slot, key, False)
+            continue
 
+        if not isinstance(obj, dict):
+            slot[key] = obj
+            continue
 
-def generate_workflow_schema() -> Dict[str, Any]:
+        if not constrain:
+            if _is_flat(obj.values()) and not _may_rewrite(obj, patterns, simplify):
+                # No pass can rewrite this node; return it unchanged
+                slot[key] = obj
+                continue
+            result = dict.fromkeys(obj)
+            slot[key] = result
+            push_finish(obj, result, patterns, slot, key)
+            for child_key, value in obj.items():
+                stack.append((
+                    value, depth, False,
+                    patterns and child_key not in _PATTERN_SKIP_KEYS,
+                    result, child_key
+                ))
+            continue
+
+        # Handle $ref references first (Gemini doesn't support them)
+        if "$ref" in obj:
+            # Try to resolve the reference
+            if defs:
+                ref_path = obj["$ref"]
+                if ref_path.startswith("#/$defs/"):
+                    ref_name = ref_path.replace("#/$defs/", "")
+                    if ref_name in defs:
+                        memo_key = (ref_name, depth, patterns)
+                        if memo_key in ref_memo:
+                            slot[key] = ref_memo[memo_key]
+                            continue
+                        # Inline the referenced schema and process it; the
+                        # transform builds new dicts and never mutates its input
+                        stack.append((_MEMO, memo_key, slot, key))
+                        stack.append((defs[ref_name], depth, True, patterns, slot, key))
+                        continue
+
+            # If we can't resolve, use a placeholder. It is already in final
+            # form, so one copy per conversion is shared instead of re-walked
+            placeholder = ref_memo.get(None)
+            if placeholder is None:
+                placeholder = ref_memo[None] = copy.deepcopy(_REF_PLACEHOLDER)
+            slot[key] = placeholder
+            continue
+
+        # Determine the schema type
+        schema_type = obj.get("type")
+        is_object_type = False
+
+        if isinstance(schema_type, list):
+            # Union type like ["object", "null"]
+            is_object_type = "object" in schema_type
+        elif schema_type == "object":
+            is_object_type = True
+
+        # Only apply depth limit to actual object types
+        if is_object_type and depth >= max_depth:
+            # Return a simple object schema without properties
+            # Gemini doesn't like empty properties, so we omit them entirely
+            slot[key] = {
+                "type": "object",
+                "description": f"Nested object (depth limit {max_depth} reached)"
+            }
+            continue
+
+        # Build result dict
+        result = {}
+        slot[key] = result
+        push_finish(obj, result, patterns, slot, key)
+
+        for child_key, value in obj.items():
+            kind = _TRANSFORM_KEY_KINDS.get(child_key)
+
+            # Skip Gemini-unsupported fields
+            if kind is _DROP_KEY:
+                # Log for debugging but don't include
+                if value not in [False, True]:
+                    logger.debug(f"Skipping additionalProperties with value: {value}")
+                continue
+
+            child_patterns = patterns and child_key not in _PATTERN_SKIP_KEYS
+
+            # Process based on key type
+            if kind is _PROPERTIES_KEY and isinstance(value, dict):
+                # Only increment depth if this is an object type's properties
+                if is_object_type:
+                    # Entering object properties - increment depth
+                    next_depth = depth + 1
+                else:
+                    # Non-object shouldn't have properties, but handle gracefully
+                    logger.warning(f"Non-object type {schema_type} has properties - preserving")
+                    next_depth = depth
+                push_container(value, next_depth, child_patterns, result, child_key)
+
+            elif kind is _ITEMS_KEY:
+                # Array items - check if items are objects
+                if isinstance(value, dict):
+                    item_type = value.get("type")
+                    # Only increment depth if array contains objects
+                    if item_type == "object" or (isinstance(item_type, list) and "object" in item_type):
+                        next_depth = depth + 1
+                    else:
+                        next_depth = depth
+                    result[child_key] = None
+                    stack.append((value, next_depth, True, child_patterns, result, child_key))
+                elif isinstance(value, list):
+                    # Array of schemas (tuple validation)
+                    push_items(value, depth, child_patterns, result, child_key, True)
+                else:
+                    result[child_key] = value
+
+            elif kind is _COMPOSITION_KEY and isinstance(value, list):
+                # Union/composition operators - don't increment depth
+                push_items(value, depth, child_patterns, result, child_key, True)
+
+            elif kind is _DEFS_KEY and isinstance(value, dict):
+                # Schema definitions - process without incrementing depth
+                push_container(value, depth, child_patterns, result, child_key)
+
+            else:
+                # Other nested dicts (metadata, etc.) keep constraints on; primitive
+                # values and plain lists only get the pattern/union passes
+                result[child_key] = None
+                stack.append((
+                    value, depth, isinstance(value, dict), child_patterns, result, child_key
+                ))
+
+    return root[0]
+
+
+def _is_flat(values) -> bool:
+    """Check that no value is a nested dict or list."""
+    for value in values:
+        if isinstance(value, (dict, list)):
+            return False
+    return True
+
+
+def _may_rewrite(node: Dict[str, Any], patterns: bool, simplify: bool) -> bool:
+    """Check whether _finish_node could change a node with these keys."""
+    return (patterns and node.get("type") == "string") or (
+        simplify and ("anyOf" in node or "oneOf" in node)
+    )
+
+
+def _finish_node(node: Dict[str, Any], patterns: bool, simplify: bool) -> Any:
+    """Apply node-local pattern and union rewrites to a transformed dict."""
+    # If it's a string type that might contain variable references
+    if patterns and node.get("type") == "string":
+        # Check if description suggests it might contain variables
+        desc = node.get("description", "")
+        if _VAR_KEYWORD_RE.search(desc):
+            # Add pattern to ensure proper variable format
+            if "pattern" not in node:
+                # Allow either plain text or properly formatted variables
+                node["pattern"] = VARIABLE_REF_PATTERN
+                node["description"] = f"{node.get('description', '')} (use {{name}} format for variables)"
+
+    if simplify:
+        # Handle anyOf with simple types
+        if "anyOf" in node and len(node["anyOf"]) == 2:
+            types = [item.get("type") for item in node["anyOf"]]
+            if "null" in types:
+                # Optional field - just use the non-null type
+                non_null_items = [item for item in node["anyOf"] if item.get("type") != "null"]
+                if non_null_items:
+                    return non_null_items[0]
+                # If all items are null, return the original object
+                return node
+
+        # Handle oneOf similarly
+        if "oneOf" in node:
+            # For workflow types, convert to enum if possible
+            if all(item.get("type") == "object" for item in node["oneOf"]):
+                # Keep the oneOf but add discriminator hint
+                node["discriminator"] = {"propertyName": "type"}
+
+    return node
+
+
+def generate_workflow_schema(shared: bool = False) -> Dict[str, Any]:
     """
     Generate the specific JSON Schema for WorkflowSpec.
 
-    This is optimized for the meta-agent use case.
+    This is optimized for the meta-agent use case. The schema is a pure
+    function of the WorkflowSpec class, so it is built once per process and
+    callers receive a deep copy they are free to mutate.
+
+    Args:
+        shared: Return the cached schema itself instead of a copy. For
+            read-only use (e.g. serializing it into a request); mutating
+            it changes the schema for every later caller.
     """
     # Import here to avoid circular dependency
     from src.agents.models import WorkflowSpec
 
+    schema = _WORKFLOW_SCHEMA_CACHE.get(WorkflowSpec)
+    if schema is None:
+        schema = _build_workflow_schema(WorkflowSpec)
+        _WORKFLOW_SCHEMA_CACHE[WorkflowSpec] = schema
+
+    return schema if shared else copy.deepcopy(schema)
+
+
+def invalidate_schema_cache() -> None:
+    """Drop memoized workflow and model schemas, e.g. after patching a model in tests."""
+    _WORKFLOW_SCHEMA_CACHE.clear()
+    _MODEL_SCHEMA_CACHE.clear()
+
+
+def _build_workflow_schema(workflow_model: Type[BaseModel]) -> Dict[str, Any]:
+    """Build and validate the Gemini-ready JSON Schema for a workflow model."""
     # Get base schema
-    schema = pydantic_to_json_schema(WorkflowSpec, max_depth=3)
+    schema = pydantic_to_json_schema(workflow_model, max_depth=3)
+
+    # Validating is two extra full walks that only produce log output, so it
+    # only runs when someone will see it
+    validate = _schema_validation_enabled()
 
     # Validate the generated schema
-    validation_issues = validate_schema_for_gemini(schema)
-    if validation_issues:
-        # Log issues for debugging
-        logger.debug(f"Schema validation found {len(validation_issues)} issue(s):")
-        for issue in validation_issues:
-            if issue.startswith("ERROR"):
-                logger.error(f"  {issue}")
-            else:
-                logger.debug(f"  {issue}")
+    if validate:
+        validation_issues, error_count = _check_schema(schema)
+        if validation_issues:
+            # Log issues for debugging
+            logger.debug(f"Schema validation found {len(validation_issues)} issue(s):")
+            for issue in validation_issues:
+                if issue.startswith("ERROR"):
+                    logger.error(f"  {issue}")
+                else:
+                    logger.debug(f"  {issue}")
 
-        # Only fail on errors, not warnings
-        error_count = sum(1 for i in validation_issues if i.startswith("ERROR"))
-        if error_count > 0:
-            logger.warning(f"Schema has {error_count} error(s) that may cause Gemini API issues")
+            # Only fail on errors, not warnings
+            if error_count > 0:
+                logger.warning(f"Schema has {error_count} error(s) that may cause Gemini API issues")
 
     # Add specific constraints for workflow types
     if "properties" in schema and "workflow" in schema["properties"]:
@@ -290,7 +500,9 @@ def generate_workflow_schema() -> Dict[str, Any]:
 
         # Add enum constraint for workflow types if it's an object
         if workflow_schema.get("type") == "object":
-            workflow_schema["properties"] = workflow_schema.get("properties", {})
+            # Copy before editing; $defs expansions may be shared
+            workflow_schema = schema["properties"]["workflow"] = dict(workflow_schema)
+            workflow_schema["properties"] = dict(workflow_schema.get("properties", {}))
             workflow_schema["properties"]["type"] = {
                 "type": "string",
                 "enum": ["tool_call", "sequential", "conditional", "parallel", "orchestrator"],
@@ -307,16 +519,27 @@ def generate_workflow_schema() -> Dict[str, Any]:
     }
 
     # Final validation
-    final_issues = validate_schema_for_gemini(schema)
-    error_count = sum(1 for i in final_issues if i.startswith("ERROR"))
-    if error_count > 0:
-        logger.error(f"Final schema still has {error_count} error(s) after processing")
+    if validate:
+        _, error_count = _check_schema(schema)
+        if error_count > 0:
+            logger.error(f"Final schema still has {error_count} error(s) after processing")
 
     logger.debug(f"Generated workflow schema with {len(schema.get('properties', {}))} top-level properties")
 
     return schema
 
 
+def _schema_validation_enabled() -> bool:
+    """
+    Check whether generate_workflow_schema should validate its output.
+
+    Enabled when debug logging is on or META_FLOW_VALIDATE_SCHEMA is set.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        return True
+    return os.getenv("META_FLOW_VALIDATE_SCHEMA", "").lower() in ("1", "true", "yes")
+
+
 def validate_schema_for_gemini(schema: Dict[str, Any]) -> List[str]:
     """
     Validate that a schema is compatible with Gemini's structured output.
@@ -330,9 +553,28 @@ def validate_schema_for_gemini(schema: Dict[str, Any]) -> List[str]:
     Returns:
         List of warning/error messages (empty if valid)
     """
-    issues = []
+    issues, _ = _check_schema(schema)
+    return issues
+
+
+def _check_schema(schema: Dict[str, Any]) -> Tuple[List[str], int]:
+    """
+    Walk a schema collecting Gemini compatibility issues.
+
+    Returns:
+        Tuple of (issue messages, number of ERROR issues)
+    """
+    issues: List[str] = []
+    error_count = 0
+
+    # Explicit pre-order walk; children are pushed in reverse so issues keep
+    # the same order as a recursive traversal. Paths travel as tuples of key
+    # names and list indexes and are only formatted when an issue is recorded.
+    stack: List[Tuple[Any, tuple, int, Optional[str]]] = [(schema, (), 0, None)]
+
+    while stack:
+        obj, parts, dots, parent_type = stack.pop()
 
-    def check_schema(obj: Any, path: str = "", parent_type: str = None) -> None:
         if isinstance(obj, dict):
             # Get the type of this schema node
             obj_type = obj.get("type")
@@ -343,57 +585,79 @@ def validate_schema_for_gemini(schema: Dict[str, Any]) -> List[str]:
                     # This is the bug we're fixing!
                     if isinstance(obj_type, list):
                         if "object" not in obj_type:
-                            issues.append(f"ERROR {path}: Has 'properties' but type is {obj_type} (not object)")
+                            issues.append(f"ERROR {_format_path(parts)}: Has 'properties' but type is {obj_type} (not object)")
+                            error_count += 1
                     else:
-                        issues.append(f"ERROR {path}: Has 'properties' but type is '{obj_type}' (not object)")
-                elif not obj_type and parent_type not in ["anyOf", "oneOf", "allOf"]:
+                        issues.append(f"ERROR {_format_path(parts)}: Has 'properties' but type is '{obj_type}' (not object)")
+                        error_count += 1
+                elif not obj_type and parent_type not in _UNION_KEYS:
                     # No type specified and not a union
-                    issues.append(f"WARNING {path}: Has 'properties' but no type specified")
+                    issues.append(f"WARNING {_format_path(parts)}: Has 'properties' but no type specified")
 
             # Check for unsupported Gemini features
             if "$ref" in obj:
-                issues.append(f"ERROR {path}: Contains $ref (Gemini doesn't support)")
+                issues.append(f"ERROR {_format_path(parts)}: Contains $ref (Gemini doesn't support)")
+                error_count += 1
 
             if "additionalProperties" in obj:
-                issues.append(f"ERROR {path}: Contains additionalProperties (Gemini doesn't support)")
+                issues.append(f"ERROR {_format_path(parts)}: Contains additionalProperties (Gemini doesn't support)")
+                error_count += 1
 
             # Check for empty properties on what should be primitive types
-            if obj_type in ["string", "number", "integer", "boolean", "null"]:
+            if isinstance(obj_type, str) and obj_type in _PRIMITIVE_TYPES:
                 if "properties" in obj and obj["properties"] == {}:
-                    issues.append(f"ERROR {path}: Primitive type '{obj_type}' has empty properties {{}}")
+                    issues.append(f"ERROR {_format_path(parts)}: Primitive type '{obj_type}' has empty properties {{}}")
+                    error_count += 1
 
-            # Check for deep nesting
-            depth = path.count(".")
+            # Check for deep nesting (number of '.' separators in the path)
+            depth = dots
             if depth > 5:
-                issues.append(f"WARNING {path}: Deeply nested (depth={depth}), may cause issues")
+                issues.append(f"WARNING {_format_path(parts)}: Deeply nested (depth={depth}), may cause issues")
 
-            # Recurse into nested structures
+            # Queue nested structures
+            children = []
+            child_dots = dots + 1 if parts else dots
             for key, value in obj.items():
-                new_path = f"{path}.{key}" if path else key
+                new_parts = parts + (key,)
 
                 # Track parent type for context
-                if key in ["anyOf", "oneOf", "allOf"]:
-                    parent = key
-                elif key == "properties" and obj_type == "object":
-                    parent = "object_properties"
-                elif key == "items":
-                    parent = "array_items"
-                else:
+                parent = _VALIDATE_PARENT_TYPES.get(key)
+                if parent == "object_properties" and obj_type != "object":
                     parent = None
 
                 if isinstance(value, dict):
-                    check_schema(value, new_path, parent)
-                elif isinstance(value, list) and key in ["anyOf", "oneOf", "allOf"]:
+                    children.append((value, new_parts, child_dots, parent))
+                elif isinstance(value, list) and parent in _UNION_KEYS:
                     for i, item in enumerate(value):
                         if isinstance(item, dict):
-                            check_schema(item, f"{new_path}[{i}]", key)
+                            children.append((item, new_parts + (i,), child_dots, key))
+            stack.extend(reversed(children))
 
         elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                check_schema(item, f"{path}[{i}]")
+            stack.extend(reversed([
+                (item, parts + (i,), dots, None) for i, item in enumerate(obj)
+            ]))
 
-    check_schema(schema)
-    return issues
+    return issues, error_count
+
+
+@lru_cache(maxsize=1024)
+def _format_path(parts: tuple) -> str:
+    """Format schema path parts as 'key.key[index].key' for issue messages."""
+    path = ""
+    for part in parts:
+        if isinstance(part, int):
+            path = f"{path}[{part}]"
+        else:
+            path = f"{path}.{part}" if path else part
+    return path
+
+
+def _dumps_schema(schema: Dict[str, Any]) -> str:
+    """Serialize a schema as indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(schema, indent=2)
 
 
 # Example usage and testing
@@ -418,9 +682,8 @@ if __name__ == "__main__":
             print("✓ Schema is valid for Gemini")
 
         # Print a sample of the schema
-        import json
         print("\nGenerated Schema (excerpt):")
-        print(json.dumps(schema, indent=2)[:1000] + "...")
+        print(_dumps_schema(schema)[:1000] + "...")
 
     except ImportError as e:
         print(f"Could not import WorkflowSpec: {e}")
@@ -436,4 +699,4 @@ if __name__ == "__main__":
 
         schema = pydantic_to_json_schema(SimpleModel)
         print("Simple model schema:")
-        print(json.dumps(schema, indent=2))
\ No newline at end of file
+        print(_dumps_schema(schema))
\ No newline at end of file
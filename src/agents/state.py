@@ -5,10 +5,17 @@ This TypedDict defines the complete state that flows through all nodes
 in the LangGraph state machine, enabling checkpointing and recovery.
 """
 
-from typing import TypedDict, Optional, List, Dict, Any, Literal
+from typing import TypedDict, Optional, List, Dict, Any, Literal, Annotated
 from datetime import datetime, timezone
+from itertools import islice
+import operator
 import uuid
 
+# Retry policy shared by should_retry and build_feedback_message
+_MAX_RETRIES = 3
+_MIN_CONFIDENCE = 0.5
+_TERMINAL_STATUSES = frozenset(('escalated', 'complete'))
+
 
 class MetaAgentState(TypedDict, total=False):
     """
@@ -69,6 +76,55 @@ class MetaAgentState(TypedDict, total=False):
     Useful for debugging and escalation reports.
     """
 
+    reasoning_cache_key: Optional[str]
+    """
+    Reasoning cache key of the current inferred_structure, if it may be
+    cached. The validator caches the inference only once it passes
+    validation, and drops the entry when it fails.
+    """
+
+    use_reasoning_cache: bool
+    """
+    Whether the reasoner may reuse a validated inference for an identical
+    prompt (default True). Disable to always sample the LLM.
+    """
+
+    use_json_mode: bool
+    """
+    Whether the reasoner asks providers that support it for a bare JSON
+    response (default True). Disable for models that reject JSON mode.
+    """
+
+    stream_llm_output: bool
+    """
+    Whether the reasoner streams completions from providers that support it
+    (default True), so output that cannot be JSON is abandoned early.
+    """
+
+    parallel_attempts: int
+    """
+    Number of reasoning attempts fanned out concurrently per round.
+    1 (default) runs the single sequential reasoner.
+    """
+
+    attempt_id: int
+    """Index of a fanned-out reasoning attempt (set per Send)"""
+
+    attempt_temperature: Optional[float]
+    """Sampling temperature of a fanned-out reasoning attempt (set per Send)"""
+
+    reasoning_candidates: Annotated[List[Dict[str, Any]], operator.add]
+    """
+    Results of fanned-out reasoning attempts, accumulated across branches.
+    Each entry: {
+        'retry_count': int,                  # Round the attempt belongs to
+        'attempt_id': int,
+        'inferred_structure': Optional[dict],
+        'llm_output': Optional[str],
+        'error': Optional[str]               # Set if the attempt failed
+    }
+    """
+
     # ===== Validation Stage =====
     workflow_spec: Optional[Dict[str, Any]]
     """
@@ -76,6 +132,12 @@ class MetaAgentState(TypedDict, total=False):
     Only set if validation passes.
     """
 
+    serialized_spec: Optional[str]
+    """
+    JSON serialization of the validated WorkflowSpec.
+    Produced by the validator so the generator doesn't rebuild the model.
+    """
+
     validation_errors: List[str]
     """List of Pydantic validation errors (if any)"""
 
@@ -94,6 +156,12 @@ class MetaAgentState(TypedDict, total=False):
     retry_count: int
     """Number of retry attempts (max 3)"""
 
+    next_action: Literal["generator", "retry", "escalation"]
+    """
+    Where to go after validation, decided by the validator node so the
+    routing function only has to look it up.
+    """
+
     should_escalate: bool
     """
     Whether to escalate to human review.
@@ -150,7 +218,11 @@ def create_initial_state(
     raw_spec: str,
     llm_provider: str = "aimlapi",
     model_version: str = None,
-    prompt_version: str = "2.0.0"
+    prompt_version: str = "2.0.0",
+    parallel_attempts: int = 1,
+    use_reasoning_cache: bool = True,
+    use_json_mode: bool = True,
+    stream_llm_output: bool = True
 ) -> MetaAgentState:
     """
     Create initial state for new workflow processing.
@@ -160,6 +232,10 @@ def create_initial_state(
         llm_provider: LLM provider to use ('aimlapi' or 'gemini')
         model_version: LLM model identifier (optional, reads from env vars or uses hardcoded default)
         prompt_version: Prompt template version
+        parallel_attempts: Concurrent reasoning attempts per round (1 = sequential)
+        use_reasoning_cache: Reuse validated inferences for identical prompts
+        use_json_mode: Request native JSON output from providers that support it
+        stream_llm_output: Stream completions from providers that support it
 
     Returns:
         MetaAgentState initialized for processing
@@ -188,9 +264,16 @@ def create_initial_state(
         inferred_structure={},
         confidence_score=0.0,
         reasoning_trace=[],
+        reasoning_cache_key=None,
+        use_reasoning_cache=use_reasoning_cache,
+        use_json_mode=use_json_mode,
+        stream_llm_output=stream_llm_output,
+        parallel_attempts=parallel_attempts,
+        reasoning_candidates=[],
 
         # Validation
         workflow_spec=None,
+        serialized_spec=None,
         validation_errors=[],
 
         # Control
@@ -220,7 +303,12 @@ def add_error_to_state(
     recoverable: bool = True
 ) -> MetaAgentState:
     """
-    Add error to state history.
+    Build a state update that appends an error to the history.
+
+    The input state is not modified; nodes return the result directly so
+    LangGraph only writes the error_history channel (returning the whole
+    state would rewrite every channel and re-apply reducers such as the
+    reasoning_candidates append).
 
     Args:
         state: Current state
@@ -230,7 +318,7 @@ def add_error_to_state(
         recoverable: Whether retry is possible
 
     Returns:
-        Updated state with error added
+        State update containing the extended error_history
     """
     error_entry = {
         'stage': stage,
@@ -240,12 +328,7 @@ def add_error_to_state(
         'recoverable': recoverable
     }
 
-    if 'error_history' not in state:
-        state['error_history'] = []
-
-    state['error_history'].append(error_entry)
-
-    return state
+    return {'error_history': [*state.get('error_history', []), error_entry]}
 
 
 def should_retry(state: MetaAgentState) -> bool:
@@ -259,11 +342,11 @@ def should_retry(state: MetaAgentState) -> bool:
         True if retry is warranted, False otherwise
     """
     # Don't retry if already escalated or complete
-    if state.get('execution_status') in ['escalated', 'complete']:
+    if state.get('execution_status') in _TERMINAL_STATUSES:
         return False
 
     # Don't retry if retry limit reached
-    if state.get('retry_count', 0) >= 3:
+    if state.get('retry_count', 0) >= _MAX_RETRIES:
         return False
 
     # Don't retry if explicitly marked for escalation
@@ -275,7 +358,7 @@ def should_retry(state: MetaAgentState) -> bool:
         return True
 
     # Retry if confidence is very low
-    if state.get('confidence_score', 1.0) < 0.5:
+    if state.get('confidence_score', 1.0) < _MIN_CONFIDENCE:
         return True
 
     # Otherwise, don't retry
@@ -292,27 +375,23 @@ def build_feedback_message(state: MetaAgentState) -> str:
     Returns:
         Human-readable feedback for LLM
     """
-    messages = []
-
-    # Add validation errors
-    if state.get('validation_errors'):
-        messages.append("Validation Errors:")
-        for error in state['validation_errors'][:5]:  # Limit to 5 errors
-            messages.append(f"  - {error}")
+    sections = []
 
-    # Add parsing errors
-    if state.get('parsing_errors'):
-        messages.append("\nParsing Errors:")
-        for error in state['parsing_errors'][:5]:
-            messages.append(f"  - {error}")
+    # Add validation and parsing errors (at most 5 of each)
+    for title, key in (("Validation Errors:", 'validation_errors'),
+                       ("Parsing Errors:", 'parsing_errors')):
+        errors = state.get(key)
+        if errors:
+            sections.append("\n".join([title, *(f"  - {error}" for error in islice(errors, 5))]))
 
     # Add confidence warning
-    if state.get('confidence_score', 1.0) < 0.5:
-        messages.append(f"\nLow confidence score: {state['confidence_score']:.2f}")
-        messages.append("Please review the specification more carefully.")
+    if state.get('confidence_score', 1.0) < _MIN_CONFIDENCE:
+        sections.append(
+            f"Low confidence score: {state['confidence_score']:.2f}\n"
+            "Please review the specification more carefully."
+        )
 
     # Add retry count
-    retry_count = state.get('retry_count', 0)
-    messages.append(f"\nRetry attempt: {retry_count + 1}/3")
+    sections.append(f"Retry attempt: {state.get('retry_count', 0) + 1}/{_MAX_RETRIES}")
 
-    return "\n".join(messages)
+    return "\n\n".join(sections)
@@ -57,6 +57,83 @@ Outputs:
 """
 
 
+# ===== Stub LLM =====
+
+# A confident (four sequential steps) WorkflowSpec for SIMPLE_SPEC that
+# passes validation
+VALID_STRUCTURE = {
+    'name': 'customer_lookup',
+    'description': 'Look up customer information by ID',
+    'inputs': [
+        {'name': 'customer_id', 'type': 'string', 'description': 'Customer ID'},
+    ],
+    'outputs': [
+        {'name': 'customer_info', 'type': 'object', 'description': 'Customer info'},
+    ],
+    'workflow': {
+        'type': 'sequential',
+        'steps': [
+            {
+                'type': 'tool_call',
+                'tool_name': f'step_{i}',
+                'parameters': {'customer_id': '{{customer_id}}'},
+                'assigns_to': 'customer_info' if i == 4 else f'result_{i}'
+            }
+            for i in range(1, 5)
+        ]
+    }
+}
+
+# Equally confident shape that fails WorkflowSpec validation
+INVALID_STRUCTURE = {
+    'name': 'customer_lookup',
+    'description': 'Look up customer information by ID',
+    'workflow': {'type': 'sequential', 'steps': [{'type': 'tool_call'}] * 4}
+}
+
+
+class StubProvider:
+    """LLM provider stand-in answering every call with respond(**kwargs)."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def generate(self, system_prompt, user_prompt, **kwargs):
+        self.calls.append(kwargs)
+        return self.respond(**kwargs)
+
+    def get_model_name(self):
+        return "stub"
+
+
+class BadRequestError(Exception):
+    """Stand-in for an SDK's 400 response to an unsupported JSON mode."""
+
+
+class JsonModeStubProvider(StubProvider):
+    """Stub provider that accepts json_mode and can reject it with BadRequestError."""
+
+    supports_json_mode = True
+
+    def is_json_mode_rejection(self, error):
+        return isinstance(error, BadRequestError)
+
+
+@pytest.fixture
+def use_stub_provider(monkeypatch):
+    """Serve model 'stub-model' from a given stub provider, with an empty reasoning cache."""
+    from collections import OrderedDict
+    from src.agents import nodes
+
+    def install(provider):
+        monkeypatch.setattr(nodes, "_PROVIDER_CACHE", {("aimlapi", "stub-model"): provider})
+        return provider
+
+    monkeypatch.setattr(nodes, "_REASONING_CACHE", OrderedDict())
+    return install
+
+
 # ===== Unit Tests for Individual Nodes =====
 
 def test_parser_node_valid_spec():
@@ -104,6 +181,16 @@ def test_parser_extracts_numbered_steps():
     assert steps[3] == 'Format response as JSON'
 
 
+def test_parser_cache_returns_independent_sections():
+    """Test that repeated parses of the same spec don't share mutable state."""
+    first = parser_node(create_initial_state(SIMPLE_SPEC))
+    first['parsed_sections']['steps'].append('Injected step')
+
+    second = parser_node(create_initial_state(SIMPLE_SPEC))
+    assert len(second['parsed_sections']['steps']) == 4
+    assert second['parsed_sections'] is not first['parsed_sections']
+
+
 # ===== Integration Tests =====
 
 @pytest.mark.skipif(
@@ -233,5 +320,404 @@ def test_confidence_scoring():
     assert confidence < 1.0
 
 
+def test_validation_feedback_grouping():
+    """Test that validation errors are grouped into the right feedback sections."""
+    from src.agents.nodes import _format_validation_feedback
+
+    errors = [
+        "workflow.sequential.type: Input should be 'sequential'",
+        "name: Field required",
+        "workflow.steps.1: references undefined variable 'data'",
+        "version: String should match pattern",
+    ]
+    feedback = _format_validation_feedback(errors)
+    assert "TYPE FIELD ERRORS:" in feedback
+    assert "MISSING REQUIRED FIELDS:" in feedback
+    assert "VARIABLE REFERENCE ERRORS:" in feedback
+    assert "OTHER ERRORS:" in feedback
+    assert "DISCRIMINATED UNION ERROR DETECTED:" not in feedback
+
+    # Many type errors mentioning workflow variants trigger the union guidance
+    union_errors = [
+        f"workflow.OrchestratorWorkflow.field{i}.type: Input should be 'x'"
+        for i in range(11)
+    ]
+    feedback = _format_validation_feedback(union_errors + ["name: Field required"])
+    assert "DISCRIMINATED UNION ERROR DETECTED:" in feedback
+    assert "MISSING REQUIRED FIELDS:" not in feedback
+
+
+def test_provider_instances_are_reused(monkeypatch):
+    """Test that the reasoner reuses provider instances per (provider, model)."""
+    from src.agents import nodes, providers
+
+    created = []
+
+    def fake_create_provider(provider_name, model=None):
+        created.append((provider_name, model))
+        return object()
+
+    monkeypatch.setattr(providers, "create_provider", fake_create_provider)
+    monkeypatch.setattr(nodes, "_PROVIDER_CACHE", {})
+
+    first = nodes._get_cached_provider("gemini", "model-a")
+    assert nodes._get_cached_provider("gemini", "model-a") is first
+    assert nodes._get_cached_provider("gemini", "model-b") is not first
+    assert created == [("gemini", "model-a"), ("gemini", "model-b")]
+
+
+def test_pipeline_merges_node_updates(use_stub_provider):
+    """Test that partial node updates are merged into the final graph state."""
+    import json
+
+    provider = use_stub_provider(StubProvider(lambda **_: json.dumps(VALID_STRUCTURE)))
+
+    result = run_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model")
+
+    assert result['execution_status'] == 'complete'
+    assert result['raw_spec'] == SIMPLE_SPEC
+    assert result['parsed_sections']['workflow'] == 'customer_lookup'
+    assert result['confidence_score'] == 1.0
+    assert json.loads(result['generated_json'])['name'] == 'customer_lookup'
+
+    # An identical spec reuses the cached inference instead of calling the LLM
+    again = run_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model")
+    assert again['generated_json'] == result['generated_json']
+    assert len(provider.calls) == 1
+
+    # ... unless the caller opts out
+    fresh = run_meta_agent(
+        raw_spec=SIMPLE_SPEC, model_version="stub-model", use_reasoning_cache=False
+    )
+    assert fresh['use_reasoning_cache'] is False
+    assert fresh['generated_json'] == result['generated_json']
+    assert len(provider.calls) == 2
+
+
+def test_reasoning_cache_entries_expire(monkeypatch):
+    """Test that reasoning cache entries are dropped once their TTL passes."""
+    from collections import OrderedDict
+    from src.agents import nodes
+
+    monkeypatch.setattr(nodes, "_REASONING_CACHE", OrderedDict())
+    nodes._store_reasoning_result("fresh", {'name': 'a'}, '{"name": "a"}')
+    assert nodes._lookup_reasoning_result("fresh") == ({'name': 'a'}, '{"name": "a"}')
+
+    monkeypatch.setattr(nodes, "_REASONING_CACHE_TTL", 0)
+    nodes._store_reasoning_result("stale", {'name': 'b'}, '{"name": "b"}')
+    assert nodes._lookup_reasoning_result("stale") is None
+    assert "stale" not in nodes._REASONING_CACHE
+
+
+def test_validation_failures_retry_then_escalate(use_stub_provider):
+    """Test that the validator's next_action drives retries up to the limit."""
+    import json
+
+    use_stub_provider(StubProvider(lambda **_: json.dumps(INVALID_STRUCTURE)))
+
+    result = run_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model")
+
+    assert result['execution_status'] == 'escalated'
+    assert result['retry_count'] == 3
+    assert result['next_action'] == 'escalation'
+    assert result['validation_errors']
+
+
+def test_reasoning_cache_only_keeps_validated_inferences(use_stub_provider):
+    """Test that failed inferences are neither cached nor reused on retries."""
+    import json
+    from src.agents import nodes
+
+    provider = use_stub_provider(StubProvider(lambda **_: json.dumps(INVALID_STRUCTURE)))
+
+    # Every retry round asks the LLM again
+    result = run_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model")
+    assert result['execution_status'] == 'escalated'
+    assert len(provider.calls) == 3
+    assert not nodes._REASONING_CACHE
+
+    # The failed answer isn't served to the next run
+    provider.respond = lambda **_: json.dumps(VALID_STRUCTURE)
+    result = run_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model")
+    assert result['execution_status'] == 'complete'
+    assert len(provider.calls) == 4
+    assert len(nodes._REASONING_CACHE) == 1
+
+
+def test_reasoner_requests_json_mode_with_fallback(use_stub_provider):
+    """Test that JSON mode is requested when supported and dropped only if rejected."""
+    import json
+    from src.agents import nodes
+
+    def respond(json_mode=False, **_):
+        if json_mode:
+            raise BadRequestError("response_format not supported by this model")
+        return json.dumps({'name': 'customer_lookup'})
+
+    provider = use_stub_provider(JsonModeStubProvider(respond))
+
+    state = create_initial_state(raw_spec=SIMPLE_SPEC, model_version="stub-model")
+    state.update(nodes.parser_node(state))
+    result = nodes.reasoner_node(state)
+
+    assert result['inferred_structure'] == {'name': 'customer_lookup'}
+    assert [call.get('json_mode', False) for call in provider.calls] == [True, False]
+
+    # Other failures aren't retried without JSON mode
+    def time_out(**_):
+        raise TimeoutError("read timed out")
+
+    provider.calls.clear()
+    provider.respond = time_out
+    result = nodes.reasoner_node(state)
+    assert result['error_history'][-1]['error_type'] == 'TimeoutError'
+    assert [call.get('json_mode', False) for call in provider.calls] == [True]
+
+    # Callers can turn JSON mode off for a whole run
+    provider.calls.clear()
+    provider.respond = respond
+    run_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model", use_json_mode=False)
+    assert provider.calls
+    assert not any(call.get('json_mode') for call in provider.calls)
+
+
+def test_json_mode_stream_opening_with_prose_is_not_retried(use_stub_provider):
+    """Test that an early stream abort in JSON mode fails fast instead of falling back."""
+    from src.agents import nodes
+    from src.agents.errors import ReasoningError
+
+    class StreamingStubProvider(JsonModeStubProvider):
+        def generate_stream(self, system_prompt, user_prompt, **kwargs):
+            self.calls.append(kwargs)
+            yield from ['Sure! ', 'Here is the workflow: ', '{}']
+
+    provider = use_stub_provider(StreamingStubProvider(lambda **_: '{}'))
+
+    state = create_initial_state(raw_spec=SIMPLE_SPEC, model_version="stub-model")
+    state.update(nodes.parser_node(state))
+    with pytest.raises(ReasoningError):
+        nodes.reasoner_node(state)
+
+    assert [call.get('json_mode', False) for call in provider.calls] == [True]
+
+
+def test_streamed_output_is_joined_and_prose_aborts_early():
+    """Test that streamed chunks are joined and non-JSON output stops the stream."""
+    from src.agents.errors import ReasoningError
+    from src.agents.nodes import _collect_stream
+
+    assert _collect_stream((c for c in ['\n', '{"name": ', '"x"}', '\n']), {}) == '{"name": "x"}'
+
+    consumed = []
+
+    def prose():
+        for chunk in ['  ', 'Here is', ' the JSON', ' you asked for']:
+            consumed.append(chunk)
+            yield chunk
+
+    with pytest.raises(ReasoningError):
+        _collect_stream(prose(), {})
+    assert consumed == ['  ', 'Here is']
+
+    # Gemini output is left for JSON repair instead of being cut short
+    assert _collect_stream(prose(), {}, check_head=False) == 'Here is the JSON you asked for'
+
+
+def test_streaming_can_be_disabled_per_run(use_stub_provider):
+    """Test that stream_llm_output=False makes the reasoner call generate()."""
+    import json
+
+    class StreamingStubProvider(StubProvider):
+        def generate_stream(self, system_prompt, user_prompt, **kwargs):
+            raise AssertionError("streamed despite stream_llm_output=False")
+
+    provider = use_stub_provider(StreamingStubProvider(lambda **_: json.dumps(VALID_STRUCTURE)))
+
+    result = run_meta_agent(
+        raw_spec=SIMPLE_SPEC, model_version="stub-model", stream_llm_output=False
+    )
+
+    assert result['execution_status'] == 'complete'
+    assert len(provider.calls) == 1
+
+
+def test_async_pipeline_awaits_provider(use_stub_provider):
+    """Test that arun_meta_agent awaits the provider's async generation."""
+    import asyncio
+    import json
+    from src.agents import arun_meta_agent
+
+    class AsyncStubProvider(StubProvider):
+        def generate(self, system_prompt, user_prompt, **kwargs):
+            raise AssertionError("sync generate called from async pipeline")
+
+        async def agenerate(self, system_prompt, user_prompt, **kwargs):
+            self.calls.append(kwargs)
+            return self.respond(**kwargs)
+
+    use_stub_provider(AsyncStubProvider(lambda **_: json.dumps(VALID_STRUCTURE)))
+
+    result = asyncio.run(arun_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model"))
+
+    assert result['execution_status'] == 'complete'
+    assert json.loads(result['generated_json'])['name'] == 'customer_lookup'
+
+
+def test_async_json_modes_await_provider():
+    """Test that the async reasoner awaits Claude's agenerate_json directly."""
+    import asyncio
+    from src.agents import nodes
+
+    class ClaudeStub:
+        def generate_json(self, **kwargs):
+            raise AssertionError("blocking generate_json called from async path")
+
+        async def agenerate_json(self, **kwargs):
+            assert kwargs['retry_on_invalid'] is True
+            return '{"name": "customer_lookup"}'
+
+    structure, output = asyncio.run(
+        nodes._ainfer_structure(ClaudeStub(), 'claude', 'prompt', {})
+    )
+
+    assert structure == {'name': 'customer_lookup'}
+    assert output == '{"name": "customer_lookup"}'
+
+
+def test_parallel_attempts_select_valid_candidate(use_stub_provider):
+    """Test that fanned-out reasoning attempts are joined on a valid candidate."""
+    import json
+
+    def respond(temperature, **_):
+        if temperature == 0.1:
+            raise RuntimeError("rate limited")
+        if temperature == 0.2:
+            return json.dumps(INVALID_STRUCTURE)
+        return json.dumps(VALID_STRUCTURE)
+
+    provider = use_stub_provider(StubProvider(respond))
+
+    result = run_meta_agent(raw_spec=SIMPLE_SPEC, model_version="stub-model", parallel_attempts=3)
+
+    assert sorted(call['temperature'] for call in provider.calls) == [0.1, 0.2, 0.3]
+    assert len(result['reasoning_candidates']) == 3
+    assert result['execution_status'] == 'complete'
+    assert json.loads(result['generated_json'])['workflow'] == VALID_STRUCTURE['workflow']
+
+
+def test_batched_checkpointer_defers_commits(tmp_path):
+    """Test that BatchedSqliteSaver commits once when the batch exits."""
+    import sqlite3
+    from src.agents import BatchedSqliteSaver
+
+    commits = []
+
+    class CountingConnection(sqlite3.Connection):
+        def commit(self):
+            commits.append(1)
+            super().commit()
+
+    conn = sqlite3.connect(
+        tmp_path / "checkpoints.db", check_same_thread=False, factory=CountingConnection
+    )
+    saver = BatchedSqliteSaver(conn)
+    saver.setup()
+
+    # Outside a batch every write commits, like SqliteSaver
+    commits.clear()
+    with saver.cursor() as cur:
+        cur.execute("CREATE TABLE notes (body TEXT)")
+    assert len(commits) == 1
+
+    commits.clear()
+    with saver.batched():
+        for i in range(4):
+            with saver.cursor() as cur:
+                cur.execute("INSERT INTO notes VALUES (?)", (f"step {i}",))
+        assert commits == []
+        # Writes are visible on the connection before the commit
+        with saver.cursor(transaction=False) as cur:
+            assert cur.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 4
+    assert len(commits) == 1
+
+    other = sqlite3.connect(tmp_path / "checkpoints.db")
+    assert other.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 4
+
+
+def test_batch_generate_bounds_concurrency():
+    """Test that abatch_generate keeps order, caps in-flight calls and collects errors."""
+    import asyncio
+    from src.agents.providers import LLMProvider
+
+    class BatchStubProvider(LLMProvider):
+        in_flight = 0
+        peak = 0
+
+        def generate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=4000):
+            raise AssertionError("batch should use agenerate")
+
+        async def agenerate(self, system_prompt, user_prompt, temperature=0.1, max_tokens=4000):
+            BatchStubProvider.in_flight += 1
+            BatchStubProvider.peak = max(BatchStubProvider.peak, BatchStubProvider.in_flight)
+            await asyncio.sleep(0.01)
+            BatchStubProvider.in_flight -= 1
+            if user_prompt == "fail":
+                raise ValueError("boom")
+            return user_prompt.upper()
+
+        def get_model_name(self):
+            return "stub"
+
+    requests = [("system", f"prompt {i}") for i in range(8)] + [("system", "fail")]
+    results = asyncio.run(BatchStubProvider().abatch_generate(requests, max_concurrency=3))
+
+    assert results[:8] == [f"PROMPT {i}" for i in range(8)]
+    assert isinstance(results[8], ValueError)
+    assert BatchStubProvider.peak == 3
+
+
+def test_prewarm_runs_in_background_and_swallows_errors(monkeypatch):
+    """Test that connection pre-warming runs off-thread, ignores failures and can be disabled."""
+    import threading
+    from src.agents.providers import _start_prewarm
+
+    done = threading.Event()
+    caller = threading.current_thread()
+    threads = []
+
+    def request():
+        threads.append(threading.current_thread())
+        done.set()
+        raise ConnectionError("offline")
+
+    _start_prewarm("stub", request)
+    assert done.wait(timeout=5)
+    assert threads[0] is not caller
+
+    monkeypatch.setenv("META_FLOW_PREWARM", "0")
+    _start_prewarm("stub", lambda: threads.append(None))
+    assert len(threads) == 1
+
+
+def test_errors_survive_pickle_and_deepcopy():
+    """Test that error attributes survive pickling and copying."""
+    import copy
+    import pickle
+    from src.agents.errors import ParsingError, ReasoningError
+
+    error = ReasoningError('bad', confidence_score=0.5, retry_count=2)
+    for restored in (pickle.loads(pickle.dumps(error)), copy.deepcopy(error)):
+        assert restored.message == 'bad'
+        assert restored.confidence_score == 0.5
+        assert restored.retry_count == 2
+        assert restored.details == error.details
+        assert restored.to_dict() == error.to_dict()
+
+    error = ParsingError('missing', missing_sections=['Steps'], line_number=3)
+    restored = pickle.loads(pickle.dumps(error))
+    assert restored.missing_sections == ['Steps']
+    assert restored.line_number == 3
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
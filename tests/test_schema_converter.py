@@ -0,0 +1,97 @@
+"""
+Unit tests for the Pydantic → Gemini JSON Schema converter.
+
+Tests cover:
+- Gemini compatibility of the generated WorkflowSpec schema
+- Memoization and invalidation of the workflow schema
+- Per-class caching of Pydantic's base schema
+"""
+
+from src.agents.schema_converter import (
+    generate_workflow_schema,
+    invalidate_schema_cache,
+    pydantic_to_json_schema,
+    validate_schema_for_gemini,
+)
+
+
+def _walk(obj):
+    """Yield every dict node in a schema."""
+    if isinstance(obj, dict):
+        yield obj
+        for value in obj.values():
+            yield from _walk(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _walk(item)
+
+
+def test_workflow_schema_is_gemini_compatible():
+    """Generated schema has no $ref/additionalProperties and no ERROR issues."""
+    schema = generate_workflow_schema()
+
+    assert schema["type"] == "object"
+    assert "workflow" in schema["properties"]
+    assert "_available_variables" in schema["properties"]
+
+    for node in _walk(schema):
+        assert "$ref" not in node
+        assert "additionalProperties" not in node
+
+    issues = validate_schema_for_gemini(schema)
+    assert not [issue for issue in issues if issue.startswith("ERROR")]
+
+
+def test_workflow_schema_is_memoized_but_independent():
+    """Repeated calls return equal schemas that don't share mutable state."""
+    first = generate_workflow_schema()
+    second = generate_workflow_schema()
+
+    assert first == second
+
+    first["properties"]["injected"] = {"type": "string"}
+    assert "injected" not in generate_workflow_schema()["properties"]
+
+    # Read-only callers can skip the copy
+    assert generate_workflow_schema(shared=True) is generate_workflow_schema(shared=True)
+    assert generate_workflow_schema(shared=True) == second
+
+
+def test_invalidate_schema_cache_forces_rebuild(monkeypatch):
+    """After invalidation the schema is rebuilt from the model."""
+    from src.agents import schema_converter
+
+    builds = []
+    build = schema_converter._build_workflow_schema
+    monkeypatch.setattr(
+        schema_converter, "_build_workflow_schema",
+        lambda model: builds.append(model) or build(model),
+    )
+
+    invalidate_schema_cache()
+    generate_workflow_schema()
+    generate_workflow_schema()
+    assert len(builds) == 1
+
+    invalidate_schema_cache()
+    generate_workflow_schema()
+    assert len(builds) == 2
+
+
+def test_model_json_schema_is_cached_per_class(monkeypatch):
+    """Pydantic generates a model's base schema once; conversions stay independent."""
+    from pydantic import BaseModel
+
+    class Step(BaseModel):
+        name: str
+
+    calls = []
+    generate = Step.model_json_schema
+    monkeypatch.setattr(Step, "model_json_schema", lambda: calls.append(1) or generate())
+
+    first = pydantic_to_json_schema(Step)
+    first["properties"]["name"]["injected"] = True
+    second = pydantic_to_json_schema(Step)
+
+    assert len(calls) == 1
+    assert "injected" not in second["properties"]["name"]